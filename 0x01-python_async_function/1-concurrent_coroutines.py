@@ -2,21 +2,73 @@
 """
 Execute multiple coroutines concurrently
 """
-from typing import List
+from typing import AsyncIterator, Awaitable, Iterable, List, TypeVar
 import asyncio
 wait_random = __import__('0-basic_async_syntax').wait_random
 
+T = TypeVar('T')
 
-async def wait_n(n: int, max_delay: int) -> List[float]:
-    """_summary_
+
+async def bounded_as_completed(aws: Iterable[Awaitable[T]],
+                               concurrency: int) -> AsyncIterator[T]:
+    """Run awaitables with at most `concurrency` in flight
+
+    Awaitables are pulled from `aws` only when a slot frees up, so a
+    lazy iterable keeps memory flat however many there are. Results
+    are yielded in completion order; leaving early cancels the rest.
+
+    Args:
+        aws (Iterable[Awaitable[T]]): awaitables to run
+        concurrency (int): maximum number running at the same time
+
+    Yields:
+        T: each result as soon as it is available
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    aws = iter(aws)
+    finished = asyncio.Queue()
+    in_flight = set()
+
+    def start_next() -> None:
+        """Schedule the next awaitable, if any"""
+        aw = next(aws, None)
+        if aw is None:
+            return
+        future = asyncio.ensure_future(aw)
+        future.add_done_callback(finished.put_nowait)
+        in_flight.add(future)
+
+    for _ in range(concurrency):
+        start_next()
+    try:
+        while in_flight:
+            future = await finished.get()
+            in_flight.discard(future)
+            start_next()
+            yield future.result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+async def wait_n(n: int, max_delay: int,
+                 concurrency: int = None) -> List[float]:
+    """Spawn wait_random n times
 
     Args:
-        n (int): _description_
-        max_delay (int): _description_
+        n (int): number of coroutines to run
+        max_delay (int): maximum delay of each coroutine
+        concurrency (int): maximum number of coroutines in flight,
+            all n at once when None
 
     Returns:
-        List[float]: _description_
+        List[float]: the delays in completion order
     """
+    if concurrency is not None:
+        coroutines = (wait_random(max_delay) for _ in range(n))
+        return [delay async for delay in
+                bounded_as_completed(coroutines, concurrency)]
     futures = [wait_random(max_delay) for _ in range(n)]
     futures = asyncio.as_completed(futures)
     delays = [await futures for futures in futures]
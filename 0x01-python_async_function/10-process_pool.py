@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Shard wait_n across a pool of processes, one event loop per worker
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+import asyncio
+import heapq
+import os
+import time
+wait_random = __import__('0-basic_async_syntax').wait_random
+
+
+def run_shard(n: int, max_delay: int) -> List[Tuple[float, float]]:
+    """Run one shard on its own event loop, in a worker process
+
+    Args:
+        n (int): number of coroutines in the shard
+        max_delay (int): maximum delay of each coroutine
+
+    Returns:
+        List[Tuple[float, float]]: (completion time, delay) pairs in
+            completion order
+    """
+    stamped = []
+
+    async def collect() -> None:
+        """Stamp each delay as it completes"""
+        for future in asyncio.as_completed(
+                [wait_random(max_delay) for _ in range(n)]):
+            delay = await future
+            stamped.append((time.monotonic(), delay))
+
+    asyncio.run(collect())
+    return stamped
+
+
+async def process_wait_n(n: int, max_delay: int,
+                         workers: int = None) -> List[float]:
+    """wait_n spread over `workers` processes
+
+    Each worker runs its share of the n coroutines on its own event
+    loop; the shards are merged back in completion order using the
+    system-wide monotonic clock.
+
+    Args:
+        n (int): number of coroutines to run
+        max_delay (int): maximum delay of each coroutine
+        workers (int): number of processes, os.cpu_count() when None
+
+    Returns:
+        List[float]: the delays in completion order
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = [n // workers + (i < n % workers) for i in range(workers)]
+    loop = asyncio.get_running_loop()
+    executor = ProcessPoolExecutor(max_workers=workers)
+    futures = [loop.run_in_executor(executor, run_shard, shard, max_delay)
+               for shard in shards if shard]
+    try:
+        stamped = await asyncio.gather(*futures)
+    finally:
+        for future in futures:
+            future.cancel()
+        # waiting for running shards here would block the event loop
+        executor.shutdown(wait=False, cancel_futures=True)
+    return [delay for _, delay in heapq.merge(*stamped)]
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Run coroutines on a virtual clock instead of waiting in real time
+"""
+from typing import Any, Awaitable, Callable, List, Tuple
+import asyncio
+import selectors
+import time
+wait_n = __import__('1-concurrent_coroutines').wait_n
+
+
+class VirtualSelector:
+    """Selector wrapper skipping idle waits
+
+    When nothing is ready and the loop would block until its next
+    timer, the virtual clock jumps to that timer instead. With no
+    timer at all, or while run_in_executor work is outstanding, the
+    wait is real and the clock moves by the real time waited, so
+    threads and I/O still work and take their real time.
+    """
+
+    def __init__(self, loop: 'VirtualClockEventLoop',
+                 selector: selectors.BaseSelector) -> None:
+        """Init method of VirtualSelector"""
+        self._loop = loop
+        self._selector = selector
+
+    def select(self, timeout: float = None) -> List[Tuple]:
+        """Ready events, advancing the clock instead of sleeping"""
+        events = self._selector.select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            return self._selector.select(None)
+        if self._loop.executor_work:
+            start = time.perf_counter()
+            events = self._selector.select(timeout)
+            self._loop.advance(
+                min(timeout, time.perf_counter() - start))
+            return events
+        self._loop.advance(timeout)
+        return []
+
+    def __getattr__(self, name: str) -> Any:
+        """Everything else is the wrapped selector's"""
+        return getattr(self._selector, name)
+
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """Event loop whose time only moves when it has nothing to do
+
+    asyncio.sleep, call_later and timeouts all go through loop.time(),
+    so wait_random and async_generator complete in the same logical
+    order and at the same logical times as on a real loop, without
+    the wall-clock wait.
+    """
+
+    def __init__(self) -> None:
+        """Init method of VirtualClockEventLoop"""
+        self._virtual_time = 0.0
+        self.executor_work = 0
+        super().__init__(VirtualSelector(self, selectors.DefaultSelector()))
+
+    def time(self) -> float:
+        """Virtual seconds since the loop was created"""
+        return self._virtual_time
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward"""
+        self._virtual_time += seconds
+
+    def run_in_executor(self, executor: Any, func: Callable,
+                        *args: Any) -> asyncio.Future:
+        """run_in_executor, counting the calls still running"""
+        future = super().run_in_executor(executor, func, *args)
+        self.executor_work += 1
+        future.add_done_callback(self._executor_done)
+        return future
+
+    def _executor_done(self, future: asyncio.Future) -> None:
+        """One executor call less is running"""
+        self.executor_work -= 1
+
+
+def run_virtual(main: Awaitable[Any]) -> Any:
+    """asyncio.run on a VirtualClockEventLoop
+
+    Args:
+        main (Awaitable[Any]): the coroutine to run
+
+    Returns:
+        Any: what main returns
+    """
+    loop = VirtualClockEventLoop()
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+def simulate(fan_out: Callable[..., Awaitable[Any]],
+             *args: Any) -> Tuple[float, float]:
+    """Run fan_out(*args) virtually
+
+    Args:
+        fan_out (Callable[..., Awaitable[Any]]): e.g. wait_n
+        *args (Any): its arguments
+
+    Returns:
+        Tuple[float, float]: logical and wall seconds the run took
+    """
+    async def timed() -> float:
+        """Logical duration of the run"""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await fan_out(*args)
+        return loop.time() - start
+
+    start_time = time.perf_counter()
+    logical = run_virtual(timed())
+    return logical, time.perf_counter() - start_time
+
+
+def measure_virtual_time(n: int, max_delay: int) -> float:
+    """measure_time on the virtual clock
+
+    Args:
+        n (int): number of coroutines to run
+        max_delay (int): maximum delay of each coroutine
+
+    Returns:
+        float: logical time of wait_n divided by n
+    """
+    logical, _ = simulate(wait_n, n, max_delay)
+    return logical / n
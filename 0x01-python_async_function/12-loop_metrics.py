@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Opt-in event-loop instrumentation for wait_n, task_wait_n and
+async_comprehension
+
+LoopMetrics.install(loop) sets a task factory that counts every task
+and times one in every sample_every of them by coroutine name, and
+starts a probe sampling loop lag and ready-queue depth. export()
+renders everything in the Prometheus text format.
+
+    metrics = LoopMetrics()
+    run_instrumented(wait_n(1000, 0), metrics)
+    print(metrics.export())
+"""
+from bisect import bisect_left
+from collections.abc import Coroutine
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+import asyncio
+import sys
+import time
+wait_n = __import__('1-concurrent_coroutines').wait_n
+task_wait_n = __import__('4-tasks').task_wait_n
+
+BUCKETS: List[float] = [float("{}e{}".format(mantissa, exponent))
+                        for exponent in range(-6, 2)
+                        for mantissa in (1, 2.5, 5)]
+PROBE_INTERVAL = 0.01
+SAMPLE_EVERY = 16
+
+
+class Histogram:
+    """Counts of observations per upper bound"""
+
+    def __init__(self, bounds: List[float] = BUCKETS) -> None:
+        """Init method of Histogram"""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Count value in the first bucket bounding it"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def export(self, name: str, labels: str = "") -> List[str]:
+        """Cumulative bucket, sum and count lines"""
+        lines = []
+        cumulative = 0
+        separator = "," if labels else ""
+        for bound, count in zip(self.bounds + ["+Inf"], self.counts):
+            cumulative += count
+            lines.append('{}_bucket{{{}{}le="{}"}} {}'.format(
+                name, labels, separator, bound, cumulative))
+        braces = "{" + labels + "}" if labels else ""
+        lines.append("{}_sum{} {}".format(name, braces, self.total))
+        lines.append("{}_count{} {}".format(name, braces, self.count))
+        return lines
+
+
+class TaskStats:
+    """Lifecycle metrics of the sampled tasks of one coroutine function"""
+
+    def __init__(self) -> None:
+        """Init method of TaskStats"""
+        self.sampled = 0
+        self.states = {"done": 0, "cancelled": 0, "failed": 0}
+        self.steps = 0
+        self.schedule_delay = Histogram()
+        self.running = Histogram()
+        self.awaiting = Histogram()
+
+
+class _TimedCoroutine(Coroutine):
+    """Coroutine wrapper timing the steps of the wrapped one"""
+    __slots__ = ("_coro", "_stats", "_created", "_started", "_running")
+
+    def __init__(self, coro: Coroutine, stats: TaskStats) -> None:
+        """Init method of _TimedCoroutine"""
+        self._coro = coro
+        self._stats = stats
+        self._created = time.perf_counter()
+        self._started = None
+        self._running = 0.0
+
+    def _step(self, method: Callable, *args: Any) -> Any:
+        """Run one step of the wrapped coroutine"""
+        start = time.perf_counter()
+        if self._started is None:
+            self._started = start
+            self._stats.schedule_delay.observe(start - self._created)
+        try:
+            result = method(*args)
+        except StopIteration:
+            self._finish(start, "done")
+            raise
+        except asyncio.CancelledError:
+            self._finish(start, "cancelled")
+            raise
+        except BaseException:
+            self._finish(start, "failed")
+            raise
+        self._running += time.perf_counter() - start
+        self._stats.steps += 1
+        return result
+
+    def _finish(self, start: float, state: str) -> None:
+        """Record the lifetime of the task"""
+        end = time.perf_counter()
+        stats = self._stats
+        self._running += end - start
+        stats.steps += 1
+        stats.states[state] += 1
+        stats.running.observe(self._running)
+        stats.awaiting.observe(end - self._created - self._running)
+
+    def send(self, value: Any) -> Any:
+        """Step with value"""
+        return self._step(self._coro.send, value)
+
+    def throw(self, *args: Any) -> Any:
+        """Step raising an exception inside the coroutine"""
+        return self._step(self._coro.throw, *args)
+
+    def close(self) -> None:
+        """Close the wrapped coroutine"""
+        self._coro.close()
+
+    def __next__(self) -> Any:
+        """Step with None"""
+        return self._step(self._coro.send, None)
+
+    def __await__(self) -> '_TimedCoroutine':
+        """The wrapper is its own iterator"""
+        return self
+
+    def __iter__(self) -> '_TimedCoroutine':
+        """The wrapper is its own iterator"""
+        return self
+
+
+class LoopMetrics:
+    """Task lifecycle, loop lag and queue depth metrics of a loop"""
+
+    def __init__(self, sample_every: int = SAMPLE_EVERY,
+                 probe_interval: float = PROBE_INTERVAL) -> None:
+        """Init method of LoopMetrics
+
+        Timing a task costs a few microseconds, about a third of what
+        creating and running a wait_random task costs, so only a
+        sample of the tasks is timed, and only those are looked up
+        by name.
+
+        Args:
+            sample_every (int): time one task in that many, 1 to time
+                them all
+            probe_interval (float): seconds between two lag samples
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.sample_every = sample_every
+        self.probe_interval = probe_interval
+        self.created = 0
+        self.tasks: Dict[str, TaskStats] = {}
+        self.lag = Histogram()
+        self.queue_depth = Histogram([2 ** i for i in range(16)])
+        self._loop = None
+        self._probe = None
+        self._previous_factory = None
+
+    def _task_factory(self, loop: asyncio.AbstractEventLoop,
+                      coro: Coroutine, **kwargs: Any) -> asyncio.Task:
+        """Count the task, timing it if it is sampled, and create it
+        with the factory the loop had before, if any"""
+        self.created += 1
+        if self.created % self.sample_every == 0:
+            name = getattr(coro, "__qualname__", type(coro).__name__)
+            stats = self.tasks.get(name)
+            if stats is None:
+                stats = self.tasks[name] = TaskStats()
+            stats.sampled += 1
+            coro = _TimedCoroutine(coro, stats)
+        if self._previous_factory is not None:
+            return self._previous_factory(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    def _sample(self, expected: float) -> None:
+        """Record how late the probe ran and the ready-queue depth
+
+        The depth is read from the private `_ready` deque of asyncio's
+        own loops; it is recorded as 0 on loops without it, e.g. uvloop.
+        """
+        loop = self._loop
+        now = loop.time()
+        self.lag.observe(max(0.0, now - expected))
+        self.queue_depth.observe(len(getattr(loop, "_ready", ())))
+        expected = now + self.probe_interval
+        self._probe = loop.call_at(expected, self._sample, expected)
+
+    def install(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start collecting on loop"""
+        if self._loop is not None:
+            raise RuntimeError("LoopMetrics is already installed")
+        self._loop = loop
+        self._previous_factory = loop.get_task_factory()
+        loop.set_task_factory(self._task_factory)
+        expected = loop.time() + self.probe_interval
+        self._probe = loop.call_at(expected, self._sample, expected)
+
+    def uninstall(self) -> None:
+        """Stop collecting, keeping what was recorded"""
+        if self._loop is None:
+            return
+        self._probe.cancel()
+        self._loop.set_task_factory(self._previous_factory)
+        self._loop = self._probe = self._previous_factory = None
+
+    def export(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        lines = ["# TYPE asyncio_tasks_created_total counter",
+                 "asyncio_tasks_created_total {}".format(self.created),
+                 "# TYPE asyncio_tasks_sampled_total counter"]
+        for name, stats in self.tasks.items():
+            lines.append('asyncio_tasks_sampled_total{{coro="{}"}} {}'.format(
+                name, stats.sampled))
+        lines.append("# TYPE asyncio_tasks_finished_total counter")
+        for name, stats in self.tasks.items():
+            for state, count in stats.states.items():
+                lines.append(
+                    'asyncio_tasks_finished_total{{coro="{}",state="{}"}} '
+                    '{}'.format(name, state, count))
+        lines.append("# TYPE asyncio_task_steps_total counter")
+        for name, stats in self.tasks.items():
+            lines.append('asyncio_task_steps_total{{coro="{}"}} {}'.format(
+                name, stats.steps))
+        for metric, attribute in (
+                ("asyncio_task_schedule_delay_seconds", "schedule_delay"),
+                ("asyncio_task_running_seconds", "running"),
+                ("asyncio_task_awaiting_seconds", "awaiting")):
+            lines.append("# TYPE {} histogram".format(metric))
+            for name, stats in self.tasks.items():
+                lines.extend(getattr(stats, attribute).export(
+                    metric, 'coro="{}"'.format(name)))
+        lines.append("# TYPE asyncio_loop_lag_seconds histogram")
+        lines.extend(self.lag.export("asyncio_loop_lag_seconds"))
+        lines.append("# TYPE asyncio_ready_queue_depth histogram")
+        lines.extend(self.queue_depth.export("asyncio_ready_queue_depth"))
+        return "\n".join(lines) + "\n"
+
+
+def run_instrumented(main: Awaitable[Any],
+                     metrics: LoopMetrics = None) -> Any:
+    """asyncio.run with metrics collected on the loop
+
+    Args:
+        main (Awaitable[Any]): the coroutine to run
+        metrics (LoopMetrics): where to record, a new one when None
+
+    Returns:
+        Any: what main returns
+    """
+    metrics = metrics or LoopMetrics()
+
+    async def instrumented() -> Any:
+        """Install the metrics around main"""
+        metrics.install(asyncio.get_running_loop())
+        try:
+            return await main
+        finally:
+            metrics.uninstall()
+
+    return asyncio.run(instrumented())
+
+
+def measure_overhead(fan_out: Callable[..., Awaitable[Any]],
+                     *args: Any, repeat: int = 5) -> Tuple[float, float]:
+    """Best wall time of fan_out(*args) without and with metrics
+
+    The plain and instrumented runs alternate so that both see the
+    same machine noise.
+
+    Args:
+        fan_out (Callable[..., Awaitable[Any]]): e.g. wait_n
+        *args (Any): its arguments
+        repeat (int): runs of each, the fastest counts
+
+    Returns:
+        Tuple[float, float]: plain and instrumented seconds
+    """
+    def timed(run: Callable[[], Any]) -> float:
+        """Wall time of run"""
+        start_time = time.perf_counter()
+        run()
+        return time.perf_counter() - start_time
+
+    plain, instrumented = [], []
+    for _ in range(repeat):
+        plain.append(timed(lambda: asyncio.run(fan_out(*args))))
+        instrumented.append(
+            timed(lambda: run_instrumented(fan_out(*args))))
+    return min(plain), min(instrumented)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, "../0x02-python_async_comprehension")
+    async_comprehension = __import__(
+        '1-async_comprehension').async_comprehension
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for name, fan_out, args in (("wait_n", wait_n, (n, 0.1)),
+                                ("task_wait_n", task_wait_n, (n, 0.1))):
+        plain, instrumented = measure_overhead(fan_out, *args)
+        print("# {} n={} overhead {:+.1%}".format(
+            name, n, instrumented / plain - 1))
+
+    async def entry_points() -> None:
+        """The instrumented entry points, concurrently"""
+        await asyncio.gather(wait_n(n, 0.1), task_wait_n(n, 0.1),
+                             async_comprehension())
+
+    metrics = LoopMetrics()
+    run_instrumented(entry_points(), metrics)
+    print(metrics.export(), end="")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Choose the event loop implementation and keep a loop across runs
+"""
+from typing import Any, Awaitable, Callable, Dict, List
+import asyncio
+import importlib
+
+LoopFactory = Callable[[], asyncio.AbstractEventLoop]
+
+
+def _uvloop_factory() -> LoopFactory:
+    """uvloop.new_event_loop, ImportError when uvloop is missing"""
+    return importlib.import_module("uvloop").new_event_loop
+
+
+def _virtual_factory() -> LoopFactory:
+    """The virtual-clock loop of 11-virtual_clock"""
+    return __import__('11-virtual_clock').VirtualClockEventLoop
+
+
+LOOP_FACTORIES: Dict[str, Callable[[], LoopFactory]] = {
+    "uvloop": _uvloop_factory,
+    "asyncio": lambda: asyncio.new_event_loop,
+    "virtual": _virtual_factory,
+}
+
+
+def available_loops() -> List[str]:
+    """Names of the loop implementations usable here"""
+    names = []
+    for name, factory in LOOP_FACTORIES.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def detect_loop() -> str:
+    """Fastest installed real-time loop: uvloop, then asyncio"""
+    try:
+        _uvloop_factory()
+    except ImportError:
+        return "asyncio"
+    return "uvloop"
+
+
+def get_loop_factory(loop: str = None) -> LoopFactory:
+    """Factory of the named loop implementation
+
+    Args:
+        loop (str): a key of LOOP_FACTORIES, detect_loop() when None
+
+    Returns:
+        LoopFactory: builds a new loop of that implementation
+    """
+    name = loop or detect_loop()
+    if name not in LOOP_FACTORIES:
+        raise ValueError("unknown loop {!r}, expected one of {}".format(
+            name, ", ".join(LOOP_FACTORIES)))
+    try:
+        return LOOP_FACTORIES[name]()
+    except ImportError as error:
+        raise ValueError("loop {!r} is not installed".format(name)) from error
+
+
+class LoopRunner:
+    """Run coroutines one after another on the same loop
+
+    asyncio.run builds and tears down a loop on every call; a
+    LoopRunner builds it on the first run and keeps it until close, in
+    the way of asyncio.Runner, which only exists from Python 3.11.
+
+        with LoopRunner("uvloop") as runner:
+            for n in sizes:
+                runner.run(wait_n(n, 0))
+    """
+
+    def __init__(self, loop: str = None) -> None:
+        """Init method of LoopRunner
+
+        Args:
+            loop (str): loop implementation, see get_loop_factory
+        """
+        self._factory = get_loop_factory(loop)
+        self._loop = None
+
+    def __enter__(self) -> 'LoopRunner':
+        """Use the runner as a context manager"""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the loop"""
+        self.close()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """The runner's loop, built on first use"""
+        if self._loop is None:
+            self._loop = self._factory()
+        return self._loop
+
+    def run(self, main: Awaitable[Any]) -> Any:
+        """Run main to completion on the runner's loop
+
+        Args:
+            main (Awaitable[Any]): the coroutine to run
+
+        Returns:
+            Any: what main returns
+        """
+        loop = self.get_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(main)
+        finally:
+            asyncio.set_event_loop(None)
+
+    def close(self) -> None:
+        """Cancel what is left on the loop and close it"""
+        loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        try:
+            tasks = asyncio.all_tasks(loop)
+            if tasks:
+                for task in tasks:
+                    task.cancel()
+                loop.run_until_complete(
+                    asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
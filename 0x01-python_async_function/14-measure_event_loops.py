@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Compare the scheduling overhead of the event loop implementations
+"""
+import sys
+from typing import Dict, Tuple
+
+measure_time = __import__('2-measure_runtime').measure_time
+event_loops = __import__('13-event_loops')
+
+
+def measure_loops(n: int, calls: int = 5) -> Dict[str, Tuple[float, float]]:
+    """Seconds per coroutine of measure_time(n, 0) for each loop
+
+    Args:
+        n (int): coroutines per call
+        calls (int): calls per loop, the fastest counts
+
+    Returns:
+        Dict[str, Tuple[float, float]]: per loop, the time with a fresh
+            loop per call and with one LoopRunner for all calls
+    """
+    results = {}
+    for name in event_loops.available_loops():
+        fresh = min(measure_time(n, 0, loop=name) for _ in range(calls))
+        with event_loops.LoopRunner(name) as runner:
+            persistent = min(measure_time(n, 0, runner=runner)
+                             for _ in range(calls))
+        results[name] = fresh, persistent
+    return results
+
+
+if __name__ == "__main__":
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print("default loop: {}".format(event_loops.detect_loop()))
+    for exponent in range(1, max_exponent + 1):
+        n = 10 ** exponent
+        print("n=10^{}".format(exponent))
+        for name, (fresh, persistent) in measure_loops(n).items():
+            print("  {:8} fresh {:8.2f} us/coroutine  persistent {:8.2f} "
+                  "us/coroutine".format(name, fresh * 1e6, persistent * 1e6))
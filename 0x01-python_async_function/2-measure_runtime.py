@@ -2,24 +2,65 @@
 """
 Measure the runtime of coroutines
 """
+from typing import Any, Dict, Iterable
 import asyncio
+import functools
 import time
 
 wait_n = __import__('1-concurrent_coroutines').wait_n
 
 
-def measure_time(n: int, max_delay: int) -> float:
-    """_summary_
+def measure_time(n: int, max_delay: int, workers: int = None,
+                 loop: str = None, runner: Any = None) -> float:
+    """Average time per coroutine of wait_n
 
     Args:
-        n (int): _description_
-        max_delay (int): _description_
+        n (int): number of coroutines to run
+        max_delay (int): maximum delay of each coroutine
+        workers (int): shard the coroutines over this many processes
+            with process_wait_n, single event loop when None
+        loop (str): event loop implementation from 13-event_loops,
+            asyncio.run's default loop when None
+        runner (LoopRunner): run on this persistent loop instead of
+            a fresh one; excludes loop
 
     Returns:
-        float: _description_
+        float: total time divided by n
     """
+    if loop is not None and runner is not None:
+        raise ValueError("pass either loop or runner")
+    fan_out = wait_n
+    if workers is not None:
+        fan_out = __import__('10-process_pool').process_wait_n
+        fan_out = functools.partial(fan_out, workers=workers)
+    run, fresh = asyncio.run, None
+    if runner is not None:
+        run = runner.run
+    elif loop is not None:
+        fresh = __import__('13-event_loops').LoopRunner(loop)
+        run = fresh.run
     start_time = time.perf_counter()
-    asyncio.run(wait_n(n, max_delay))
+    try:
+        run(fan_out(n, max_delay))
+    finally:
+        if fresh is not None:
+            fresh.close()
     total_time = time.perf_counter() - start_time
 
     return total_time / n
+
+
+def measure_throughput(n: int, max_delay: int,
+                       worker_counts: Iterable[int]) -> Dict[int, float]:
+    """Coroutines completed per second for each worker count
+
+    Args:
+        n (int): number of coroutines to run
+        max_delay (int): maximum delay of each coroutine
+        worker_counts (Iterable[int]): process counts to try
+
+    Returns:
+        Dict[int, float]: throughput keyed by worker count
+    """
+    return {workers: 1 / measure_time(n, max_delay, workers)
+            for workers in worker_counts}
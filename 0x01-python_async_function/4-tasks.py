@@ -5,18 +5,27 @@ Execute multiple coroutines at the same time with async
 from typing import List
 import asyncio
 task_wait_random = __import__('3-tasks').task_wait_random
+bounded_as_completed = __import__(
+    '1-concurrent_coroutines').bounded_as_completed
 
 
-async def task_wait_n(n: int, max_delay: int) -> List[float]:
-    """_summary_
+async def task_wait_n(n: int, max_delay: int,
+                      concurrency: int = None) -> List[float]:
+    """Spawn task_wait_random n times
 
     Args:
-        n (int): _description_
-        max_delay (int): _description_
+        n (int): number of tasks to run
+        max_delay (int): maximum delay of each task
+        concurrency (int): maximum number of tasks in flight,
+            all n at once when None
 
     Returns:
-        List[float]: _description_
+        List[float]: the delays in completion order
     """
+    if concurrency is not None:
+        tasks = (task_wait_random(max_delay) for _ in range(n))
+        return [delay async for delay in
+                bounded_as_completed(tasks, concurrency)]
     futures = [task_wait_random(max_delay) for _ in range(n)]
     futures = asyncio.as_completed(futures)
     delays = [await futures for futures in futures]
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Measure the peak memory of bounded and unbounded fan-out
+"""
+import asyncio
+import tracemalloc
+
+wait_n = __import__('1-concurrent_coroutines').wait_n
+task_wait_n = __import__('4-tasks').task_wait_n
+
+
+def measure_memory(n: int, max_delay: int, concurrency: int = None,
+                   tasks: bool = False) -> int:
+    """Peak bytes allocated while running wait_n or task_wait_n
+
+    Args:
+        n (int): number of coroutines to run
+        max_delay (int): maximum delay of each coroutine
+        concurrency (int): maximum number in flight, unbounded when None
+        tasks (bool): measure task_wait_n instead of wait_n
+
+    Returns:
+        int: peak traced memory in bytes
+    """
+    fan_out = task_wait_n if tasks else wait_n
+    tracemalloc.start()
+    try:
+        asyncio.run(fan_out(n, max_delay, concurrency))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+    for n in (1000, 10000, 100000):
+        unbounded = measure_memory(n, 0)
+        bounded = measure_memory(n, 0, concurrency=100)
+        print("n={:<7} unbounded {:8.1f} MiB  concurrency=100 {:6.2f} MiB"
+              .format(n, unbounded / 2 ** 20, bounded / 2 ** 20))
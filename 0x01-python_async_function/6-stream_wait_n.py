@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Stream the delays of concurrent coroutines as they complete
+"""
+from typing import AsyncIterator, Awaitable, Iterable, Tuple
+import asyncio
+import time
+wait_random = __import__('0-basic_async_syntax').wait_random
+task_wait_random = __import__('3-tasks').task_wait_random
+bounded_as_completed = __import__(
+    '1-concurrent_coroutines').bounded_as_completed
+
+
+async def stream_as_completed(aws: Iterable[Awaitable[float]],
+                              concurrency: int = None
+                              ) -> AsyncIterator[float]:
+    """Yield each result the moment its awaitable finishes
+
+    Args:
+        aws (Iterable[Awaitable[float]]): awaitables to run
+        concurrency (int): maximum number in flight, all at once
+            when None
+
+    Yields:
+        float: results in completion order
+    """
+    if concurrency is not None:
+        async for result in bounded_as_completed(aws, concurrency):
+            yield result
+        return
+    futures = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        for future in asyncio.as_completed(futures):
+            yield await future
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def stream_wait_n(n: int, max_delay: int,
+                  concurrency: int = None) -> AsyncIterator[float]:
+    """Streaming wait_n
+
+    Args:
+        n (int): number of coroutines to run
+        max_delay (int): maximum delay of each coroutine
+        concurrency (int): maximum number in flight, all n when None
+
+    Returns:
+        AsyncIterator[float]: the delays in completion order
+    """
+    return stream_as_completed(
+        (wait_random(max_delay) for _ in range(n)), concurrency)
+
+
+def stream_task_wait_n(n: int, max_delay: int,
+                       concurrency: int = None) -> AsyncIterator[float]:
+    """Streaming task_wait_n
+
+    Args:
+        n (int): number of tasks to run
+        max_delay (int): maximum delay of each task
+        concurrency (int): maximum number in flight, all n when None
+
+    Returns:
+        AsyncIterator[float]: the delays in completion order
+    """
+    return stream_as_completed(
+        (task_wait_random(max_delay) for _ in range(n)), concurrency)
+
+
+async def measure_first_result(n: int, max_delay: int) -> Tuple[float, float]:
+    """Time to the first and to the last delay of stream_wait_n
+
+    Args:
+        n (int): number of coroutines to run
+        max_delay (int): maximum delay of each coroutine
+
+    Returns:
+        Tuple[float, float]: seconds to the first and last result
+    """
+    start_time = time.perf_counter()
+    first_time = None
+    async for _ in stream_wait_n(n, max_delay):
+        if first_time is None:
+            first_time = time.perf_counter() - start_time
+    return first_time, time.perf_counter() - start_time
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Complete large numbers of timed waits without one timer per wait
+"""
+from typing import List
+import asyncio
+import heapq
+import math
+import random
+
+
+class TimerWheel:
+    """Hashed timer wheel resolving sleeps in batches
+
+    Every sleep is hashed into the bucket of the tick it is due at,
+    and one driver task wakes up once per non-empty tick to resolve
+    the whole bucket, instead of the event loop keeping one timer
+    handle per sleep. Sleeps finish up to `resolution` seconds late,
+    never early.
+    """
+
+    def __init__(self, resolution: float = 0.001) -> None:
+        """Init method of TimerWheel"""
+        self.resolution = resolution
+        self._buckets = {}
+        self._ticks = []
+        self._origin = None
+        self._driver = None
+        self._wake = None
+
+    def __len__(self) -> int:
+        """Number of pending sleeps"""
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def _tick(self, when: float) -> int:
+        """Tick of the loop time `when`, rounded up"""
+        return math.ceil((when - self._origin) / self.resolution)
+
+    def sleep(self, delay: float, result: float = None) -> asyncio.Future:
+        """Future resolving to `result` after `delay` seconds"""
+        loop = asyncio.get_running_loop()
+        if self._origin is None:
+            self._origin = loop.time()
+        future = loop.create_future()
+        tick = self._tick(loop.time() + delay)
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            if self._ticks and tick < self._ticks[0]:
+                # the driver sleeps until a later tick
+                self._wake_up()
+            bucket = self._buckets[tick] = []
+            heapq.heappush(self._ticks, tick)
+        bucket.append((future, result))
+        if self._driver is None or self._driver.done():
+            self._driver = loop.create_task(self._drive())
+        return future
+
+    def _wake_up(self) -> None:
+        """Make the driver look at the earliest tick again"""
+        if self._wake is not None and not self._wake.done():
+            self._wake.set_result(None)
+
+    async def _drive(self) -> None:
+        """Resolve due buckets until nothing is pending"""
+        loop = asyncio.get_running_loop()
+        while self._ticks:
+            when = self._origin + self._ticks[0] * self.resolution
+            self._wake = loop.create_future()
+            timer = loop.call_at(when, self._wake_up)
+            try:
+                await self._wake
+            finally:
+                timer.cancel()
+                self._wake = None
+            # the last tick whose time has come, rounded down so that
+            # the next bucket never resolves early
+            due_tick = math.floor(
+                (loop.time() - self._origin) / self.resolution)
+            while self._ticks and self._ticks[0] <= due_tick:
+                for future, result in self._buckets.pop(
+                        heapq.heappop(self._ticks)):
+                    if not future.done():
+                        future.set_result(result)
+
+
+async def wheel_wait_random(wheel: TimerWheel, max_delay: int = 10) -> float:
+    """wait_random sleeping on a timer wheel
+
+    Args:
+        wheel (TimerWheel): the wheel to sleep on
+        max_delay (int): maximum delay
+
+    Returns:
+        float: the delay
+    """
+    delay = random.uniform(0, max_delay)
+    return await wheel.sleep(delay, delay)
+
+
+async def wheel_wait_n(n: int, max_delay: int,
+                       resolution: float = 0.001) -> List[float]:
+    """wait_n on a timer wheel, without a task per wait
+
+    Args:
+        n (int): number of waits
+        max_delay (int): maximum delay of each wait
+        resolution (float): tick length of the wheel
+
+    Returns:
+        List[float]: the delays in completion order
+    """
+    wheel = TimerWheel(resolution)
+    completed = []
+    if n <= 0:
+        return completed
+    all_done = asyncio.get_running_loop().create_future()
+
+    def collect(future: asyncio.Future) -> None:
+        """Record a finished wait"""
+        completed.append(future.result())
+        if len(completed) == n:
+            all_done.set_result(None)
+
+    for _ in range(n):
+        delay = random.uniform(0, max_delay)
+        wheel.sleep(delay, delay).add_done_callback(collect)
+    await all_done
+    return completed
+
+
+async def batch_wait_n(n: int, max_delay: int,
+                       resolution: float = 0.001) -> List[float]:
+    """wait_n without a coroutine per wait
+
+    The n delays are drawn up front and sorted, and a single coroutine
+    sleeps from one batch of due delays to the next, handing each batch
+    over at once. Completion order is the same as wait_n, within
+    `resolution` seconds.
+
+    Args:
+        n (int): number of waits
+        max_delay (int): maximum delay of each wait
+        resolution (float): delays due within this window wake together
+
+    Returns:
+        List[float]: the delays in completion order
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    delays = sorted(random.uniform(0, max_delay) for _ in range(n))
+    completed = []
+    i = 0
+    while i < n:
+        due = math.ceil(delays[i] / resolution) * resolution
+        await asyncio.sleep(max(0, start + due - loop.time()))
+        elapsed = loop.time() - start
+        j = i
+        while j < n and delays[j] <= elapsed:
+            j += 1
+        completed.extend(delays[i:max(j, i + 1)])
+        i = max(j, i + 1)
+    return completed
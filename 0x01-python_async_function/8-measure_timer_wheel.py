@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Measure how wait_n and its timer wheel variants scale with n
+"""
+import asyncio
+import sys
+import time
+from typing import Callable, Dict
+
+wait_n = __import__('1-concurrent_coroutines').wait_n
+timer_wheel = __import__('7-timer_wheel')
+
+FAN_OUTS: Dict[str, Callable] = {
+    "wait_n": wait_n,
+    "wheel_wait_n": timer_wheel.wheel_wait_n,
+    "batch_wait_n": timer_wheel.batch_wait_n,
+}
+
+
+def measure_overhead(fan_out: Callable, n: int, max_delay: float) -> float:
+    """Seconds spent beyond max_delay completing n waits
+
+    Args:
+        fan_out (Callable): wait_n or one of its variants
+        n (int): number of waits
+        max_delay (float): maximum delay of each wait
+
+    Returns:
+        float: wall time minus max_delay
+    """
+    start_time = time.perf_counter()
+    asyncio.run(fan_out(n, max_delay))
+    return time.perf_counter() - start_time - max_delay
+
+
+if __name__ == "__main__":
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    for exponent in range(3, max_exponent + 1):
+        n = 10 ** exponent
+        print("n=10^{}".format(exponent))
+        for name, fan_out in FAN_OUTS.items():
+            overhead = measure_overhead(fan_out, n, 1)
+            print("  {:13} {:9.3f} s overhead {:8.2f} us/wait".format(
+                name, overhead, overhead / n * 1e6))
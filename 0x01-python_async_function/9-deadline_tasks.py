@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Fan out coroutines under a time budget and keep what finished
+"""
+from typing import Iterable, List
+import asyncio
+wait_random = __import__('0-basic_async_syntax').wait_random
+task_wait_random = __import__('3-tasks').task_wait_random
+
+
+async def gather_until(tasks: Iterable[asyncio.Future],
+                       timeout: float) -> List[float]:
+    """Collect results until `timeout` seconds have passed
+
+    Whatever is still running at the deadline is cancelled, and so is
+    everything if the caller itself is cancelled; either way the
+    cancelled tasks are awaited before returning, so none outlive
+    the call.
+
+    The deadline is a timer on the loop, kept apart from the tasks'
+    own errors: a task raising TimeoutError propagates like any other
+    error instead of ending the collection.
+
+    Args:
+        tasks (Iterable[asyncio.Future]): tasks already scheduled
+        timeout (float): time budget in seconds
+
+    Returns:
+        List[float]: results finished within the budget, in
+            completion order
+    """
+    loop = asyncio.get_running_loop()
+    tasks = list(tasks)
+    finished = asyncio.Queue()
+    for task in tasks:
+        task.add_done_callback(finished.put_nowait)
+    deadline = loop.call_later(timeout, finished.put_nowait, None)
+    results = []
+    try:
+        for _ in range(len(tasks)):
+            task = await finished.get()
+            if task is None:
+                break
+            results.append(task.result())
+    finally:
+        deadline.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return results
+
+
+async def wait_n_deadline(n: int, max_delay: int,
+                          timeout: float) -> List[float]:
+    """wait_n returning the delays finished within `timeout`
+
+    Args:
+        n (int): number of coroutines to run
+        max_delay (int): maximum delay of each coroutine
+        timeout (float): time budget in seconds
+
+    Returns:
+        List[float]: the delays finished in time, in completion order
+    """
+    return await gather_until(
+        [asyncio.ensure_future(wait_random(max_delay)) for _ in range(n)],
+        timeout)
+
+
+async def task_wait_n_deadline(n: int, max_delay: int,
+                               timeout: float) -> List[float]:
+    """task_wait_n returning the delays finished within `timeout`
+
+    Args:
+        n (int): number of tasks to run
+        max_delay (int): maximum delay of each task
+        timeout (float): time budget in seconds
+
+    Returns:
+        List[float]: the delays finished in time, in completion order
+    """
+    return await gather_until(
+        [task_wait_random(max_delay) for _ in range(n)], timeout)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Unittests for the bounded_as_completed function.
+"""
+import asyncio
+import unittest
+
+bounded_as_completed = __import__(
+    '1-concurrent_coroutines').bounded_as_completed
+
+
+async def sleeper(delay, result=None):
+    """Sleep for delay and return result, delay when None"""
+    await asyncio.sleep(delay)
+    return delay if result is None else result
+
+
+class TestBoundedAsCompleted(unittest.TestCase):
+    """Test cases for the bounded_as_completed function."""
+
+    def test_concurrency_cap(self):
+        """
+        Test that no more than concurrency awaitables run at once.
+        """
+        active = [0]
+        peak = [0]
+
+        async def tracked():
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            try:
+                await asyncio.sleep(0.001)
+            finally:
+                active[0] -= 1
+
+        async def run():
+            return [result async for result in
+                    bounded_as_completed((tracked() for _ in range(20)), 3)]
+
+        self.assertEqual(len(asyncio.run(run())), 20)
+        self.assertEqual(peak[0], 3)
+
+    def test_lazy_pull(self):
+        """
+        Test that awaitables are pulled only as slots free up.
+        """
+        pulled = []
+
+        def awaitables():
+            for i in range(100):
+                pulled.append(i)
+                yield sleeper(0.001, i)
+
+        async def run():
+            stream = bounded_as_completed(awaitables(), 2)
+            try:
+                await stream.__anext__()
+                return len(pulled)
+            finally:
+                await stream.aclose()
+
+        self.assertEqual(asyncio.run(run()), 3)
+
+    def test_completion_order(self):
+        """
+        Test that results come in completion order.
+        """
+        async def run():
+            aws = [sleeper(delay) for delay in (0.03, 0.01, 0.02)]
+            return [result async for result in bounded_as_completed(aws, 3)]
+
+        self.assertEqual(asyncio.run(run()), [0.01, 0.02, 0.03])
+
+    def test_exception(self):
+        """
+        Test that an exception of an awaitable is raised to the consumer.
+        """
+        async def failing():
+            await asyncio.sleep(0.001)
+            raise ValueError("boom")
+
+        async def run():
+            aws = [sleeper(0), failing(), sleeper(0.01)]
+            return [result async for result in bounded_as_completed(aws, 3)]
+
+        with self.assertRaises(ValueError):
+            asyncio.run(run())
+
+    def test_aclose_cancels(self):
+        """
+        Test that closing the stream early cancels what is in flight.
+        """
+        cancelled = []
+
+        async def slow(i):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(i)
+                raise
+
+        async def run():
+            aws = [sleeper(0, -1)] + [slow(i) for i in range(3)]
+            stream = bounded_as_completed(aws, 4)
+            first = await stream.__anext__()
+            await stream.aclose()
+            await asyncio.sleep(0)
+            return first
+
+        self.assertEqual(asyncio.run(run()), -1)
+        self.assertEqual(sorted(cancelled), [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Unittests for gather_until.
+"""
+import asyncio
+import unittest
+
+gather_until = __import__('9-deadline_tasks').gather_until
+
+
+async def after(delay: float, result: float) -> float:
+    """result after delay seconds"""
+    await asyncio.sleep(delay)
+    return result
+
+
+class TestGatherUntil(unittest.TestCase):
+    """Test cases for the gather_until function."""
+
+    def test_deadline(self):
+        """
+        Test that only the results finished in time are kept and the
+        rest is cancelled.
+        """
+        async def run():
+            tasks = [asyncio.ensure_future(after(delay, delay))
+                     for delay in (0.03, 0.01, 1)]
+            return await gather_until(tasks, 0.1), tasks
+
+        results, tasks = asyncio.run(run())
+
+        self.assertEqual(results, [0.01, 0.03])
+        self.assertTrue(tasks[2].cancelled())
+
+    def test_task_timeout_error(self):
+        """
+        Test that a task's own TimeoutError is raised instead of being
+        taken for the deadline.
+        """
+        async def timeout():
+            await asyncio.sleep(0.01)
+            raise TimeoutError("task")
+
+        async def run():
+            tasks = [asyncio.ensure_future(timeout()),
+                     asyncio.ensure_future(after(0.05, 1))]
+            return await gather_until(tasks, 1)
+
+        with self.assertRaisesRegex(TimeoutError, "task"):
+            asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Unittests for the event loop selection and LoopRunner.
+"""
+import asyncio
+import sys
+import unittest
+from unittest.mock import patch
+
+event_loops = __import__('13-event_loops')
+measure_time = __import__('2-measure_runtime').measure_time
+
+
+async def running_loop():
+    """The loop running this coroutine"""
+    return asyncio.get_running_loop()
+
+
+class TestGetLoopFactory(unittest.TestCase):
+    """Test cases for the get_loop_factory function."""
+
+    def test_asyncio(self):
+        """
+        Test that the asyncio factory builds asyncio's default loop.
+        """
+        self.assertIs(event_loops.get_loop_factory("asyncio"),
+                      asyncio.new_event_loop)
+
+    def test_unknown(self):
+        """
+        Test that an unknown loop name raises ValueError.
+        """
+        with self.assertRaises(ValueError):
+            event_loops.get_loop_factory("twisted")
+
+    def test_missing_uvloop(self):
+        """
+        Test that uvloop raises ValueError when it is not installed,
+        and is then neither detected nor available.
+        """
+        with patch.dict(sys.modules, {"uvloop": None}):
+            with self.assertRaises(ValueError):
+                event_loops.get_loop_factory("uvloop")
+            self.assertEqual(event_loops.detect_loop(), "asyncio")
+            self.assertNotIn("uvloop", event_loops.available_loops())
+
+
+class TestLoopRunner(unittest.TestCase):
+    """Test cases for the LoopRunner class."""
+
+    def test_reuses_loop(self):
+        """
+        Test that successive runs share one loop until close.
+        """
+        with event_loops.LoopRunner("asyncio") as runner:
+            first = runner.run(running_loop())
+            second = runner.run(running_loop())
+        self.assertIs(first, second)
+        self.assertTrue(first.is_closed())
+
+    def test_close_cancels_tasks(self):
+        """
+        Test that close cancels the tasks a run left behind.
+        """
+        async def leave_task():
+            return asyncio.ensure_future(asyncio.sleep(100))
+
+        runner = event_loops.LoopRunner("asyncio")
+        task = runner.run(leave_task())
+        runner.close()
+        self.assertTrue(task.cancelled())
+
+    def test_virtual(self):
+        """
+        Test that the virtual loop runs without waiting in real time.
+        """
+        async def sleep():
+            await asyncio.sleep(100)
+            return asyncio.get_running_loop().time()
+
+        with event_loops.LoopRunner("virtual") as runner:
+            self.assertEqual(runner.run(sleep()), 100)
+
+
+class TestMeasureTime(unittest.TestCase):
+    """Test cases for the loop and runner options of measure_time."""
+
+    def test_loop_and_runner(self):
+        """
+        Test that passing both loop and runner raises ValueError.
+        """
+        with event_loops.LoopRunner("asyncio") as runner:
+            with self.assertRaises(ValueError):
+                measure_time(1, 0, loop="asyncio", runner=runner)
+
+    def test_runner(self):
+        """
+        Test that measure_time runs on the runner's loop.
+        """
+        with event_loops.LoopRunner("asyncio") as runner:
+            self.assertGreaterEqual(measure_time(5, 0, runner=runner), 0)
+            self.assertFalse(runner.get_loop().is_closed())
+
+
+if __name__ == "__main__":
+    unittest.main()
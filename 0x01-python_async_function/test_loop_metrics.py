@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Unittests for the LoopMetrics class.
+"""
+import asyncio
+import unittest
+
+loop_metrics = __import__('12-loop_metrics')
+LoopMetrics = loop_metrics.LoopMetrics
+
+
+class TestLoopMetrics(unittest.TestCase):
+    """Test cases for the LoopMetrics class."""
+
+    def test_sampled_tasks(self):
+        """
+        Test that every task is counted and one in sample_every timed.
+        """
+        metrics = LoopMetrics(sample_every=2)
+        loop_metrics.run_instrumented(loop_metrics.wait_n(10, 0), metrics)
+
+        self.assertEqual(metrics.created, 10)
+        stats = metrics.tasks["wait_random"]
+        self.assertEqual(stats.sampled, 5)
+        self.assertEqual(stats.states["done"], 5)
+        self.assertIn('asyncio_tasks_sampled_total{coro="wait_random"} 5',
+                      metrics.export())
+
+    def test_previous_factory(self):
+        """
+        Test that the loop's own task factory still creates the tasks
+        and is restored by uninstall.
+        """
+        created = []
+
+        def factory(loop, coro, **kwargs):
+            created.append(coro)
+            return asyncio.Task(coro, loop=loop, **kwargs)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            loop.set_task_factory(factory)
+            metrics = LoopMetrics(sample_every=1)
+            metrics.install(loop)
+            await asyncio.ensure_future(asyncio.sleep(0))
+            metrics.uninstall()
+            return loop.get_task_factory(), metrics
+
+        restored, metrics = asyncio.run(run())
+
+        self.assertIs(restored, factory)
+        self.assertIsInstance(created[0], loop_metrics._TimedCoroutine)
+        self.assertEqual(metrics.created, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Unittests for run_shard and process_wait_n.
+"""
+import asyncio
+import time
+import unittest
+
+process_pool = __import__('10-process_pool')
+
+
+class TestProcessWaitN(unittest.TestCase):
+    """Test cases for the process_wait_n function."""
+
+    def test_run_shard(self):
+        """
+        Test that a shard stamps its delays in completion order.
+        """
+        stamped = process_pool.run_shard(5, 0.05)
+
+        self.assertEqual(len(stamped), 5)
+        self.assertEqual(stamped, sorted(stamped))
+
+    def test_sharding(self):
+        """
+        Test that every coroutine of every shard is returned, merged
+        in completion order, including with more workers than
+        coroutines.
+        """
+        for n, workers in ((9, 2), (2, 4)):
+            delays = asyncio.run(process_pool.process_wait_n(
+                n, 0.5, workers=workers))
+
+            self.assertEqual(len(delays), n)
+            for earlier, later in zip(delays, delays[1:]):
+                # shards are merged on stamps, not delays: allow for
+                # the scheduling jitter between processes
+                self.assertLess(earlier - later, 0.05)
+
+    def test_cancel(self):
+        """
+        Test that cancelling does not block the loop until the running
+        shards finish.
+        """
+        async def run():
+            start = time.perf_counter()
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    process_pool.process_wait_n(4, 3, workers=2), 0.2)
+            return time.perf_counter() - start
+
+        self.assertLess(asyncio.run(run()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unittests for the streaming wait_n variants.
+"""
+import asyncio
+import time
+import unittest
+
+stream = __import__('6-stream_wait_n')
+
+
+async def sleeper(delay):
+    """Sleep for delay and return it"""
+    await asyncio.sleep(delay)
+    return delay
+
+
+class TestStreamWaitN(unittest.TestCase):
+    """Test cases for stream_as_completed and stream_wait_n."""
+
+    def test_first_before_slowest(self):
+        """
+        Test that the first result arrives before the slowest
+        awaitable finishes, with and without a concurrency cap.
+        """
+        async def run(concurrency):
+            start_time = time.perf_counter()
+            results = stream.stream_as_completed(
+                [sleeper(0.3), sleeper(0.01)], concurrency)
+            try:
+                first = await results.__anext__()
+                return first, time.perf_counter() - start_time
+            finally:
+                await results.aclose()
+
+        for concurrency in (None, 2):
+            first, elapsed = asyncio.run(run(concurrency))
+            self.assertEqual(first, 0.01)
+            self.assertLess(elapsed, 0.3)
+
+    def test_close_cancels(self):
+        """
+        Test that closing the stream early cancels the pending futures.
+        """
+        cancelled = []
+
+        async def slow(i):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(i)
+                raise
+
+        async def run(concurrency):
+            results = stream.stream_as_completed(
+                [sleeper(0)] + [slow(i) for i in range(3)], concurrency)
+            first = await results.__anext__()
+            await results.aclose()
+            await asyncio.sleep(0)
+            return first
+
+        for concurrency in (None, 4):
+            cancelled.clear()
+            self.assertEqual(asyncio.run(run(concurrency)), 0)
+            self.assertEqual(sorted(cancelled), [0, 1, 2])
+
+    def test_stream_wait_n(self):
+        """
+        Test that stream_wait_n yields the n delays in ascending order.
+        """
+        async def run():
+            return [delay async for delay in stream.stream_wait_n(10, 0.05)]
+
+        delays = asyncio.run(run())
+        self.assertEqual(len(delays), 10)
+        self.assertEqual(delays, sorted(delays))
+
+
+if __name__ == "__main__":
+    unittest.main()
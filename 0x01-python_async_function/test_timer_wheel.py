@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unittests for the TimerWheel class.
+"""
+import asyncio
+import random
+import unittest
+
+TimerWheel = __import__('7-timer_wheel').TimerWheel
+
+
+class TestTimerWheel(unittest.TestCase):
+    """Test cases for the TimerWheel class."""
+
+    def test_sleep_order(self):
+        """
+        Test that sleeps resolve in deadline order with their results.
+        """
+        async def run():
+            wheel = TimerWheel()
+            done = []
+            for delay in (0.03, 0.01, 0.02):
+                wheel.sleep(delay, delay).add_done_callback(
+                    lambda future: done.append(future.result()))
+            await asyncio.sleep(0.05)
+            return done, len(wheel)
+
+        self.assertEqual(asyncio.run(run()), ([0.01, 0.02, 0.03], 0))
+
+    def test_never_early(self):
+        """
+        Test that no sleep resolves before its delay has passed.
+        """
+        async def run():
+            loop = asyncio.get_running_loop()
+            wheel = TimerWheel(resolution=0.01)
+            early = []
+
+            def check(start, delay):
+                def done(future):
+                    if loop.time() - start < delay - 1e-9:
+                        early.append(delay)
+                return done
+
+            futures = []
+            for _ in range(500):
+                delay = random.uniform(0, 0.1)
+                future = wheel.sleep(delay)
+                future.add_done_callback(check(loop.time(), delay))
+                futures.append(future)
+                if random.random() < 0.1:
+                    await asyncio.sleep(random.uniform(0, 0.005))
+            await asyncio.gather(*futures)
+            return early
+
+        self.assertEqual(asyncio.run(run()), [])
+
+    def test_interleaved_sleep(self):
+        """
+        Test that a sleep due before the pending ones is not held
+        back by them.
+        """
+        async def run():
+            loop = asyncio.get_running_loop()
+            wheel = TimerWheel(resolution=0.01)
+            late = wheel.sleep(2.0)
+            await asyncio.sleep(0)
+            start = loop.time()
+            await wheel.sleep(0.1)
+            elapsed = loop.time() - start
+            late.cancel()
+            return elapsed
+
+        elapsed = asyncio.run(run())
+        self.assertGreaterEqual(elapsed, 0.1)
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Unittests for the virtual-clock event loop.
+"""
+import asyncio
+import time
+import unittest
+
+virtual_clock = __import__('11-virtual_clock')
+wait_n = __import__('1-concurrent_coroutines').wait_n
+
+
+class TestVirtualClock(unittest.TestCase):
+    """Test cases for the virtual-clock event loop."""
+
+    def test_simulate_wait_n(self):
+        """
+        Test that wait_n takes at most max_delay logical seconds and
+        little wall time.
+        """
+        logical, wall = virtual_clock.simulate(wait_n, 100, 10)
+        self.assertGreater(logical, 0)
+        self.assertLessEqual(logical, 10)
+        self.assertLess(wall, 1)
+
+    def test_sleep_order(self):
+        """
+        Test that sleeps finish in logical deadline order.
+        """
+        async def run():
+            done = []
+
+            async def sleep(delay):
+                await asyncio.sleep(delay)
+                done.append(delay)
+
+            await asyncio.gather(*(sleep(delay) for delay in (30, 10, 20)))
+            return done, asyncio.get_running_loop().time()
+
+        self.assertEqual(virtual_clock.run_virtual(run()),
+                         ([10, 20, 30], 30))
+
+    def test_run_in_executor(self):
+        """
+        Test that executor work completes in real time while a timer
+        is pending, without the clock jumping to the timer.
+        """
+        async def run():
+            loop = asyncio.get_running_loop()
+            timer = asyncio.ensure_future(asyncio.sleep(100))
+            start = loop.time()
+            result = await loop.run_in_executor(None, time.sleep, 0.05)
+            elapsed = loop.time() - start
+            timer.cancel()
+            return result, elapsed, loop.executor_work
+
+        result, elapsed, executor_work = virtual_clock.run_virtual(run())
+        self.assertIsNone(result)
+        self.assertGreaterEqual(elapsed, 0.04)
+        self.assertLess(elapsed, 100)
+        self.assertEqual(executor_work, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,18 +2,25 @@
 """
 Run time for four parallel comprehensions
 """
+from typing import Callable
 import asyncio
 import time
 async_comprehension = __import__('1-async_comprehension').async_comprehension
 
 
-async def measure_runtime() -> float:
-    """_summary_
+async def measure_runtime(clock: Callable[[], float] = None) -> float:
+    """Time four async_comprehension running in parallel
+
+    Args:
+        clock (Callable[[], float]): time source, time.perf_counter
+            when None; pass the running loop's time to get logical
+            seconds on a virtual-clock loop
 
     Returns:
-        float: _description_
+        float: elapsed seconds
     """
-    start_time = time.perf_counter()
+    clock = clock or time.perf_counter
+    start_time = clock()
     await asyncio.gather(*(async_comprehension() for _ in range(4)))
-    total_time = time.perf_counter() - start_time
+    total_time = clock() - start_time
     return total_time
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Configurable, backpressured version of async_generator
+"""
+from typing import AsyncIterator, Callable, List
+import asyncio
+import random
+
+_DONE = object()
+
+
+class AsyncSource:
+    """Async source of random floats handed over in batches
+
+    A producer task fills a bounded queue while the consumer drains
+    it; once `buffer` batches are waiting the producer blocks, so a
+    slow consumer holds the producer back instead of letting batches
+    pile up. The defaults behave like async_generator: ten values,
+    one per second.
+    """
+
+    def __init__(self, count: int = 10, rate: float = 1.0,
+                 batch_size: int = 1, buffer: int = 1,
+                 value: Callable[[], float] = None) -> None:
+        """Init method of AsyncSource
+
+        Args:
+            count (int): number of values to produce
+            rate (float): values per second, unpaced when None
+            batch_size (int): values per yielded batch
+            buffer (int): batches produced ahead of the consumer
+            value (Callable[[], float]): value factory,
+                random.uniform(0, 10) when None
+        """
+        if batch_size < 1 or buffer < 1:
+            raise ValueError("batch_size and buffer must be at least 1")
+        self.count = count
+        self.rate = rate
+        self.batch_size = batch_size
+        self.buffer = buffer
+        self.value = value or (lambda: random.uniform(0, 10))
+
+    def __aiter__(self) -> AsyncIterator[List[float]]:
+        """Iterate over batches"""
+        return self.batches()
+
+    async def _produce(self, queue: asyncio.Queue) -> None:
+        """Fill queue with paced batches, then the end marker"""
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        produced = 0
+        try:
+            while produced < self.count:
+                size = min(self.batch_size, self.count - produced)
+                if self.rate is not None:
+                    next_time += size / self.rate
+                    await asyncio.sleep(max(0, next_time - loop.time()))
+                await queue.put([self.value() for _ in range(size)])
+                produced += size
+                if self.rate is not None:
+                    next_time = max(next_time, loop.time())
+        except Exception:
+            await queue.put(_DONE)
+            raise
+        await queue.put(_DONE)
+
+    async def batches(self) -> AsyncIterator[List[float]]:
+        """Yield lists of up to batch_size values
+
+        Yields:
+            List[float]: the next batch; an exception of the value
+                factory is re-raised
+        """
+        queue = asyncio.Queue(maxsize=self.buffer)
+        producer = asyncio.ensure_future(self._produce(queue))
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is _DONE:
+                    break
+                yield batch
+            await producer
+        finally:
+            producer.cancel()
+
+    async def items(self) -> AsyncIterator[float]:
+        """Yield the values one at a time
+
+        Yields:
+            float: the next value
+        """
+        async for batch in self.batches():
+            for item in batch:
+                yield item
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Async stream-processing stages to build on async_comprehension
+
+Every stage runs in its own task and hands its output to the next one
+through a bounded queue, so the stages of a pipeline overlap and a slow
+stage holds back the ones before it.
+
+    pipeline = (Pipeline(org_names)
+                .map(lambda name: AsyncGithubOrgClient(name).org(),
+                     concurrency=10)
+                .filter(lambda org: org.get("public_repos"))
+                .batch(100))
+    batches = await pipeline.collect()
+"""
+from collections import deque
+from typing import (Any, AsyncIterable, AsyncIterator, Callable, Deque,
+                    List, Tuple)
+import asyncio
+import inspect
+
+DEFAULT_BUFFER = 64
+_END = object()
+
+
+async def _feed(source: AsyncIterable, queue: asyncio.Queue) -> None:
+    """Put the items of source in queue, then the end marker"""
+    try:
+        async for item in source:
+            await queue.put(item)
+    except Exception:
+        await queue.put(_END)
+        raise
+    await queue.put(_END)
+
+
+async def buffered(source: AsyncIterable,
+                   size: int = DEFAULT_BUFFER) -> AsyncIterator:
+    """Run source in its own task, at most size items ahead
+
+    Args:
+        source (AsyncIterable): upstream stage
+        size (int): bound of the queue between the two stages
+
+    Yields:
+        Any: the items of source; its exceptions are re-raised
+    """
+    queue = asyncio.Queue(maxsize=size)
+    producer = asyncio.ensure_future(_feed(source, queue))
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            yield item
+        await producer
+    finally:
+        producer.cancel()
+
+
+async def _map(fn: Callable, source: AsyncIterable,
+               concurrency: int) -> AsyncIterator:
+    """Apply fn with up to concurrency awaitable results in flight"""
+    loop = asyncio.get_running_loop()
+    pending: Deque[asyncio.Future] = deque()
+    try:
+        async for item in source:
+            result = fn(item)
+            if inspect.isawaitable(result):
+                pending.append(asyncio.ensure_future(result))
+            else:
+                future = loop.create_future()
+                future.set_result(result)
+                pending.append(future)
+            if len(pending) >= concurrency:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def amap(fn: Callable, source: AsyncIterable, concurrency: int = 1,
+         buffer: int = DEFAULT_BUFFER) -> AsyncIterator:
+    """Map fn over source, keeping the order of the items
+
+    Args:
+        fn (Callable): plain function or one returning an awaitable
+        source (AsyncIterable): upstream stage
+        concurrency (int): awaitables run at the same time; a slow one
+            holds back the results after it
+        buffer (int): bound of the output queue
+
+    Returns:
+        AsyncIterator: the results
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    return buffered(_map(fn, source, concurrency), buffer)
+
+
+async def _filter(predicate: Callable[[Any], bool],
+                  source: AsyncIterable) -> AsyncIterator:
+    """Items of source for which predicate is true"""
+    async for item in source:
+        if predicate(item):
+            yield item
+
+
+def afilter(predicate: Callable[[Any], bool], source: AsyncIterable,
+            buffer: int = DEFAULT_BUFFER) -> AsyncIterator:
+    """Keep the items of source for which predicate is true"""
+    return buffered(_filter(predicate, source), buffer)
+
+
+async def _batch(source: AsyncIterable, size: int) -> AsyncIterator:
+    """Consecutive lists of size items, the last one possibly shorter"""
+    chunk = []
+    async for item in source:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def batch(source: AsyncIterable, size: int,
+          buffer: int = DEFAULT_BUFFER) -> AsyncIterator[List]:
+    """Group the items of source in lists of size items"""
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    return buffered(_batch(source, size), buffer)
+
+
+async def _window(source: AsyncIterable, size: int,
+                  step: int) -> AsyncIterator:
+    """Windows of size items starting every step items"""
+    items: Deque = deque(maxlen=size)
+    skip = 0
+    async for item in source:
+        items.append(item)
+        if skip:
+            skip -= 1
+        elif len(items) == size:
+            yield tuple(items)
+            skip = step - 1
+
+
+def window(source: AsyncIterable, size: int, step: int = 1,
+           buffer: int = DEFAULT_BUFFER) -> AsyncIterator[Tuple]:
+    """Sliding windows over source
+
+    Args:
+        source (AsyncIterable): upstream stage
+        size (int): items per window
+        step (int): items between the starts of two windows; windows
+            do not overlap when step equals size
+        buffer (int): bound of the output queue
+
+    Returns:
+        AsyncIterator[Tuple]: full windows only
+    """
+    if size < 1 or step < 1:
+        raise ValueError("size and step must be at least 1")
+    return buffered(_window(source, size, step), buffer)
+
+
+async def merge(*sources: AsyncIterable,
+                buffer: int = DEFAULT_BUFFER) -> AsyncIterator:
+    """Items of all sources in the order they arrive
+
+    Args:
+        sources (AsyncIterable): stages running concurrently
+        buffer (int): bound of the queue they share
+
+    Yields:
+        Any: the items; the first exception of a source is re-raised
+    """
+    queue = asyncio.Queue(maxsize=buffer)
+    producers = [asyncio.ensure_future(_feed(source, queue))
+                 for source in sources]
+    try:
+        running = len(producers)
+        while running:
+            item = await queue.get()
+            if item is _END:
+                running -= 1
+                # a failed source ends the stream at once
+                for producer in producers:
+                    if producer.done() and not producer.cancelled():
+                        producer.result()
+            else:
+                yield item
+    finally:
+        for producer in producers:
+            producer.cancel()
+
+
+class Pipeline:
+    """Chain of stages read with `async for` or collect"""
+
+    def __init__(self, source: AsyncIterable,
+                 buffer: int = DEFAULT_BUFFER) -> None:
+        """Init method of Pipeline
+
+        Args:
+            source (AsyncIterable): first stage
+            buffer (int): queue bound of the stages added later
+        """
+        self.source = source
+        self.buffer = buffer
+
+    def __aiter__(self) -> AsyncIterator:
+        """Iterate over the output of the last stage"""
+        return self.source.__aiter__()
+
+    def map(self, fn: Callable, concurrency: int = 1) -> "Pipeline":
+        """Add an amap stage"""
+        return Pipeline(amap(fn, self.source, concurrency, self.buffer),
+                        self.buffer)
+
+    def filter(self, predicate: Callable[[Any], bool]) -> "Pipeline":
+        """Add an afilter stage"""
+        return Pipeline(afilter(predicate, self.source, self.buffer),
+                        self.buffer)
+
+    def batch(self, size: int) -> "Pipeline":
+        """Add a batch stage"""
+        return Pipeline(batch(self.source, size, self.buffer), self.buffer)
+
+    def window(self, size: int, step: int = 1) -> "Pipeline":
+        """Add a window stage"""
+        return Pipeline(window(self.source, size, step, self.buffer),
+                        self.buffer)
+
+    def merge(self, *others: AsyncIterable) -> "Pipeline":
+        """Interleave the output with other stages"""
+        return Pipeline(merge(self.source, *others, buffer=self.buffer),
+                        self.buffer)
+
+    async def collect(self) -> List:
+        """Drain the pipeline into a list"""
+        return [item async for item in self]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Merge many async generators into one tagged stream
+"""
+from typing import (Any, AsyncIterable, AsyncIterator, Dict, Hashable,
+                    Iterable, Mapping, Tuple, Union)
+import asyncio
+
+_END = object()
+
+
+async def _pump(tag: Hashable, source: AsyncIterable,
+                slots: asyncio.Semaphore, queue: asyncio.Queue) -> None:
+    """Move the items of source to queue while it has a free slot"""
+    try:
+        async for item in source:
+            await slots.acquire()
+            queue.put_nowait((tag, item))
+    finally:
+        queue.put_nowait((tag, _END))
+
+
+async def fair_merge(sources: Union[Iterable[AsyncIterable],
+                                    Mapping[Hashable, AsyncIterable]],
+                     buffer: int = 1) -> AsyncIterator[Tuple[Hashable, Any]]:
+    """Items of all sources in arrival order, tagged with their source
+
+    Each source is read by its own task into a shared queue, where it
+    may hold at most `buffer` items. A fast source therefore waits for
+    the consumer instead of crowding out the slow ones.
+
+    Args:
+        sources: async iterables, tagged with their position, or a
+            mapping of tags to async iterables
+        buffer (int): items a single source may have waiting
+
+    Yields:
+        Tuple[Hashable, Any]: (tag, item); the first exception of a
+            source stops the merge and is re-raised
+    """
+    if buffer < 1:
+        raise ValueError("buffer must be at least 1")
+    if not isinstance(sources, Mapping):
+        sources = dict(enumerate(sources))
+    queue = asyncio.Queue()
+    slots: Dict[Hashable, asyncio.Semaphore] = {}
+    pumps: Dict[Hashable, asyncio.Task] = {}
+    for tag, source in sources.items():
+        slots[tag] = asyncio.Semaphore(buffer)
+        pumps[tag] = asyncio.ensure_future(
+            _pump(tag, source, slots[tag], queue))
+    try:
+        running = len(pumps)
+        while running:
+            tag, item = await queue.get()
+            if item is _END:
+                running -= 1
+                pump = pumps[tag]
+                if pump.done() and not pump.cancelled():
+                    pump.result()
+                continue
+            slots[tag].release()
+            yield tag, item
+    finally:
+        for pump in pumps.values():
+            pump.cancel()
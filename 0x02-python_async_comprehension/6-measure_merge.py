@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Measure how fair_merge scales with the number of generators
+"""
+from typing import AsyncIterator, Tuple
+import asyncio
+import sys
+import time
+fair_merge = __import__('5-fair_merge').fair_merge
+
+
+async def ticks(count: int) -> AsyncIterator[int]:
+    """count integers, giving way to the loop before each"""
+    for i in range(count):
+        await asyncio.sleep(0)
+        yield i
+
+
+async def collect(count: int) -> list:
+    """ticks drained the async_comprehension way"""
+    return [i async for i in ticks(count)]
+
+
+async def gathered(sources: int, count: int) -> float:
+    """Seconds until the gathered comprehensions all return"""
+    start_time = time.perf_counter()
+    await asyncio.gather(*(collect(count) for _ in range(sources)))
+    return time.perf_counter() - start_time
+
+
+async def merged(sources: int, count: int) -> float:
+    """Seconds until the first item of the merged stream"""
+    start_time = time.perf_counter()
+    stream = fair_merge(ticks(count) for _ in range(sources))
+    try:
+        await stream.__anext__()
+        return time.perf_counter() - start_time
+    finally:
+        await stream.aclose()
+
+
+def measure_merge(sources: int, count: int = 10) -> Tuple[float, float]:
+    """Time to merge sources generators of count items each
+
+    Args:
+        sources (int): number of concurrent generators
+        count (int): items per generator
+
+    Returns:
+        Tuple[float, float]: total seconds and items per second
+    """
+    async def drain() -> int:
+        """Number of items the merged stream yields"""
+        items = 0
+        async for _ in fair_merge(ticks(count) for _ in range(sources)):
+            items += 1
+        return items
+
+    start_time = time.perf_counter()
+    items = asyncio.run(drain())
+    total_time = time.perf_counter() - start_time
+    return total_time, items / total_time
+
+
+if __name__ == "__main__":
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    for exponent in range(1, max_exponent + 1):
+        sources = 10 ** exponent
+        total_time, rate = measure_merge(sources)
+        first_merged = asyncio.run(merged(sources, 10))
+        first_gathered = asyncio.run(gathered(sources, 10))
+        print("sources=10^{}  {:8.3f} s {:12.0f} items/s  first item "
+              "{:8.2f} ms (gather {:8.2f} ms)".format(
+                  exponent, total_time, rate, first_merged * 1000,
+                  first_gathered * 1000))
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Unittests for the async pipeline stages.
+"""
+import asyncio
+import time
+import unittest
+
+pipeline = __import__('4-async_pipeline')
+Pipeline = pipeline.Pipeline
+
+
+async def source(items, delay=0):
+    """items, each after delay seconds"""
+    for item in items:
+        await asyncio.sleep(delay)
+        yield item
+
+
+async def failing(delay=0):
+    """one item, then KeyError after delay seconds"""
+    yield 1
+    await asyncio.sleep(delay)
+    raise KeyError("source")
+
+
+class TestPipeline(unittest.TestCase):
+    """Test cases for the pipeline stages."""
+
+    def test_amap_order(self):
+        """
+        Test that amap keeps the input order whatever the completion
+        order, with plain and async functions.
+        """
+        async def slow_double(x):
+            await asyncio.sleep(0.01 * (5 - x))
+            return 2 * x
+
+        async def run():
+            return (await Pipeline(source(range(5)))
+                    .map(slow_double, concurrency=5).collect(),
+                    await Pipeline(source(range(5)))
+                    .map(lambda x: x + 1).collect())
+
+        self.assertEqual(asyncio.run(run()),
+                         ([0, 2, 4, 6, 8], [1, 2, 3, 4, 5]))
+
+    def test_amap_concurrency(self):
+        """
+        Test that amap never runs more than concurrency awaitables.
+        """
+        running = []
+        peak = []
+
+        async def track(x):
+            running.append(x)
+            peak.append(len(running))
+            await asyncio.sleep(0.005)
+            running.remove(x)
+            return x
+
+        async def run():
+            return await Pipeline(source(range(20))).map(
+                track, concurrency=3).collect()
+
+        self.assertEqual(asyncio.run(run()), list(range(20)))
+        self.assertEqual(max(peak), 3)
+
+    def test_batch_tail(self):
+        """
+        Test that the last batch holds the remaining items.
+        """
+        async def run():
+            return await Pipeline(source(range(7))).batch(3).collect()
+
+        self.assertEqual(asyncio.run(run()), [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_window(self):
+        """
+        Test sliding and tumbling windows.
+        """
+        async def run():
+            return (await Pipeline(source(range(5))).window(3).collect(),
+                    await Pipeline(source(range(7))).window(
+                        2, step=3).collect())
+
+        self.assertEqual(asyncio.run(run()), (
+            [(0, 1, 2), (1, 2, 3), (2, 3, 4)], [(0, 1), (3, 4)]))
+
+    def test_filter_merge(self):
+        """
+        Test that merge interleaves the sources in arrival order.
+        """
+        async def run():
+            return await Pipeline(source([1, 3], 0.02)).merge(
+                source([2], 0.03)).filter(lambda x: x != 3).collect()
+
+        self.assertEqual(asyncio.run(run()), [1, 2])
+
+    def test_backpressure(self):
+        """
+        Test that a stage runs at most buffer items ahead of a
+        consumer that does not read.
+        """
+        pulled = []
+
+        async def counted():
+            for i in range(100):
+                pulled.append(i)
+                yield i
+
+        async def run():
+            stage = pipeline.afilter(lambda x: True, counted(), buffer=2)
+            await stage.__anext__()
+            await asyncio.sleep(0.01)
+            await stage.aclose()
+
+        asyncio.run(run())
+        # one item taken, two queued, one blocked on put
+        self.assertEqual(len(pulled), 4)
+
+    def test_error(self):
+        """
+        Test that a source exception reaches the consumer of a stage.
+        """
+        async def run():
+            return await Pipeline(failing()).map(lambda x: x).collect()
+
+        with self.assertRaises(KeyError):
+            asyncio.run(run())
+
+    def test_merge_error(self):
+        """
+        Test that a failing source ends a merge without waiting for
+        the other sources.
+        """
+        async def run():
+            start = time.perf_counter()
+            with self.assertRaises(KeyError):
+                await Pipeline(failing()).merge(
+                    source(range(100), 0.05)).collect()
+            return time.perf_counter() - start
+
+        self.assertLess(asyncio.run(run()), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Unittests for the AsyncSource class.
+"""
+import asyncio
+import unittest
+
+AsyncSource = __import__('3-async_source').AsyncSource
+
+
+class TestAsyncSource(unittest.TestCase):
+    """Test cases for the AsyncSource class."""
+
+    def test_batches(self):
+        """
+        Test that count values are handed over in batch_size lists.
+        """
+        source = AsyncSource(count=7, rate=None, batch_size=3,
+                             value=lambda: 1.0)
+
+        async def run():
+            return [batch async for batch in source]
+
+        self.assertEqual(asyncio.run(run()),
+                         [[1.0] * 3, [1.0] * 3, [1.0]])
+
+    def test_backpressure(self):
+        """
+        Test that the producer stops buffer batches ahead of a
+        consumer that does not read.
+        """
+        produced = []
+        source = AsyncSource(count=100, rate=None, buffer=2,
+                             value=lambda: produced.append(1) or 1.0)
+
+        async def run():
+            batches = source.batches()
+            await batches.__anext__()
+            await asyncio.sleep(0.01)
+            await batches.aclose()
+
+        asyncio.run(run())
+        # one batch taken, two queued and one blocked on put
+        self.assertEqual(len(produced), 4)
+
+    def test_value_error(self):
+        """
+        Test that an exception of the value factory reaches the
+        consumer instead of leaving it waiting.
+        """
+        def value():
+            raise ZeroDivisionError()
+
+        async def run():
+            return [batch async for batch in
+                    AsyncSource(count=3, rate=None, value=value)]
+
+        with self.assertRaises(ZeroDivisionError):
+            asyncio.run(asyncio.wait_for(run(), 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
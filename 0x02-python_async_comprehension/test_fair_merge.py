@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unittests for the fair_merge function.
+"""
+import asyncio
+import time
+import unittest
+
+fair_merge = __import__('5-fair_merge').fair_merge
+
+
+async def source(items, delay=0):
+    """items, each after delay seconds"""
+    for item in items:
+        await asyncio.sleep(delay)
+        yield item
+
+
+async def collect(stream):
+    """Items of stream grouped by tag"""
+    merged = {}
+    async for tag, item in stream:
+        merged.setdefault(tag, []).append(item)
+    return merged
+
+
+class TestFairMerge(unittest.TestCase):
+    """Test cases for the fair_merge function."""
+
+    def test_list_tags(self):
+        """
+        Test that the sources of a list are tagged with their position.
+        """
+        sources = [source("ab"), source("cde")]
+        self.assertEqual(asyncio.run(collect(fair_merge(sources))),
+                         {0: ["a", "b"], 1: ["c", "d", "e"]})
+
+    def test_mapping_tags(self):
+        """
+        Test that the sources of a mapping are tagged with their key.
+        """
+        sources = {"x": source([1, 2]), "y": source([3])}
+        self.assertEqual(asyncio.run(collect(fair_merge(sources))),
+                         {"x": [1, 2], "y": [3]})
+
+    def test_buffer_bound(self):
+        """
+        Test that a source stops being read once buffer items wait.
+        """
+        pulled = []
+
+        async def endless():
+            while True:
+                pulled.append(len(pulled))
+                yield pulled[-1]
+
+        async def run(buffer):
+            pulled.clear()
+            stream = fair_merge([endless()], buffer=buffer)
+            try:
+                await stream.__anext__()
+                await asyncio.sleep(0.01)
+                return len(pulled)
+            finally:
+                await stream.aclose()
+
+        for buffer in (1, 4):
+            # the item consumed, buffer waiting and one held by the pump
+            self.assertEqual(asyncio.run(run(buffer)), buffer + 2)
+
+    def test_invalid_buffer(self):
+        """
+        Test that a buffer below 1 raises ValueError.
+        """
+        with self.assertRaises(ValueError):
+            asyncio.run(collect(fair_merge([], buffer=0)))
+
+    def test_exception_stops(self):
+        """
+        Test that the first source exception stops the merge and is
+        re-raised without waiting for the other sources.
+        """
+        async def failing():
+            yield 1
+            raise KeyError("source")
+
+        start_time = time.perf_counter()
+        with self.assertRaises(KeyError):
+            asyncio.run(collect(fair_merge(
+                [failing(), source(range(100), 0.01)])))
+        self.assertLess(time.perf_counter() - start_time, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Benchmarks for the github org client utilities.
+
+Run ``./benchmarks.py`` to run every benchmark against a local stub
+HTTP server, or ``./benchmarks.py <name> ...`` to pick some.
+"""
+import importlib
+import json
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Sequence,
+)
+
+import requests
+
+from client import compact_repos
+from fixtures import TEST_PAYLOAD
+from utils import (
+    access_nested_map,
+    compile_path,
+    extract_path,
+    get_json,
+    make_session,
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serve the fixture payloads over keep-alive HTTP/1.1"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    routes: Dict[str, bytes] = {}
+
+    def do_GET(self) -> None:
+        """Reply with the payload registered for the path"""
+        body = self.routes.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        """Keep the benchmark output quiet"""
+
+
+class StubServer:
+    """Local HTTP server running in a background thread.
+    Example
+    -------
+    >>> with StubServer({"/orgs/google": {"login": "google"}}) as url:
+    ...     get_json(url + "/orgs/google")
+    {'login': 'google'}
+    """
+
+    def __init__(self, routes: Dict[str, object]) -> None:
+        """Init method of StubServer"""
+        handler = type("Handler", (StubHandler,), {
+            "routes": {path: json.dumps(payload).encode()
+                       for path, payload in routes.items()},
+        })
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+
+    def __enter__(self) -> str:
+        """Start serving and return the base URL"""
+        self._thread.start()
+        host, port = self._server.server_address
+        return "http://{}:{}".format(host, port)
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop serving"""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def requests_per_second(fetch: Callable[[], object], n: int) -> float:
+    """Call ``fetch`` n times and return the achieved rate"""
+    start_time = time.perf_counter()
+    for _ in range(n):
+        fetch()
+    return n / (time.perf_counter() - start_time)
+
+
+def bench_session(n: int = 500) -> None:
+    """Compare a fresh connection per request with the pooled session"""
+    org_payload, repos_payload, _, _ = TEST_PAYLOAD[0]
+    routes = {"/orgs/google": org_payload, "/orgs/google/repos": repos_payload}
+    with StubServer(routes) as base_url:
+        url = base_url + "/orgs/google/repos"
+        session = make_session()
+        before = requests_per_second(lambda: requests.get(url).json(), n)
+        after = requests_per_second(lambda: get_json(url, session), n)
+        session.close()
+    print("get_json x{}".format(n))
+    print("  requests.get     {:10.1f} req/s".format(before))
+    print("  pooled session   {:10.1f} req/s ({:.2f}x)".format(
+        after, after / before))
+
+
+def scaled_repos(n: int) -> List[Dict]:
+    """n repos cycling through the fixture repos"""
+    repos = TEST_PAYLOAD[0][1]
+    return [repos[i % len(repos)] for i in range(n)]
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Fastest of repeat timed calls of fn"""
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def bench_access(n: int = 100000) -> None:
+    """Compare access_nested_map with compiled and batch accessors"""
+    repos = scaled_repos(n)
+    path = ("license", "key")
+    getter = compile_path(path)
+
+    def nested_map_loop():
+        for repo in repos:
+            try:
+                access_nested_map(repo, path)
+            except KeyError:
+                pass
+
+    def compiled_loop():
+        for repo in repos:
+            try:
+                getter(repo)
+            except KeyError:
+                pass
+
+    baseline = best_of(nested_map_loop)
+    print("license key of {} repos".format(n))
+    for label, fn in [
+        ("access_nested_map", nested_map_loop),
+        ("compile_path", compiled_loop),
+        ("extract_path", lambda: extract_path(repos, getter, None)),
+    ]:
+        elapsed = best_of(fn)
+        print("  {:18} {:8.2f} ms ({:.2f}x)".format(
+            label, elapsed * 1000, baseline / elapsed))
+
+
+def traced_size(build: Callable[[], object]) -> int:
+    """Bytes still allocated by what build returns"""
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def bench_compact(n: int = 50000) -> None:
+    """Compare the resident size of raw and projected repos"""
+    body = json.dumps(scaled_repos(n))
+    raw = traced_size(lambda: json.loads(body))
+    compact = traced_size(lambda: compact_repos(json.loads(body)))
+    print("resident size of {} repos".format(n))
+    print("  dicts        {:10.1f} MiB".format(raw / 2 ** 20))
+    print("  RepoRecord   {:10.1f} MiB ({:.1%})".format(
+        compact / 2 ** 20, compact / raw))
+
+
+def traced_peak(run: Callable[[], object]) -> int:
+    """Peak bytes allocated while run executes"""
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_stream(n: int = 20000) -> None:
+    """Compare the peak memory of buffered and streamed decoding"""
+    with StubServer({"/repos": scaled_repos(n)}) as base_url:
+        url = base_url + "/repos"
+        session = make_session()
+
+        def count_licensed(repos):
+            return sum(1 for repo in repos if repo.get("license"))
+
+        buffered = traced_peak(
+            lambda: count_licensed(get_json(url, session)))
+        streamed = traced_peak(
+            lambda: count_licensed(get_json(url, session, stream=True)))
+        session.close()
+    print("peak memory filtering {} repos".format(n))
+    print("  buffered   {:10.1f} MiB".format(buffered / 2 ** 20))
+    print("  streamed   {:10.1f} MiB ({:.1%})".format(
+        streamed / 2 ** 20, streamed / buffered))
+
+
+def bench_decode(sizes: Sequence[int] = (1000, 10000, 50000)) -> None:
+    """Compare the throughput of the installed JSON decoders"""
+    decoders = {"json": json.loads}
+    for name in ("ujson", "orjson"):
+        try:
+            decoders[name] = importlib.import_module(name).loads
+        except ImportError:
+            print("  ({} is not installed)".format(name))
+    for n in sizes:
+        body = json.dumps(scaled_repos(n)).encode()
+        mib = len(body) / 2 ** 20
+        print("decode {} repos ({:.1f} MiB)".format(n, mib))
+        for name, loads in decoders.items():
+            elapsed = best_of(lambda: loads(body), repeat=3)
+            print("  {:8} {:10.1f} MiB/s".format(name, mib / elapsed))
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "session": bench_session,
+    "access": bench_access,
+    "compact": bench_compact,
+    "stream": bench_stream,
+    "decode": bench_decode,
+}
+
+
+def main(names: List[str]) -> None:
+    """Run the named benchmarks, or all of them"""
+    for name in names or BENCHMARKS:
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
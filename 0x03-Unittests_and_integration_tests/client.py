@@ -1,31 +1,233 @@
 #!/usr/bin/env python3
 """A github org client
 """
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from types import MappingProxyType
 from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
     List,
     Dict,
+    Mapping,
 )
 
+import requests
+
 from utils import (
     get_json,
-    access_nested_map,
+    get_json_page,
+    iter_json_items,
+    LRUResponseCache,
+    TTLCache,
+    async_memoize,
+    compile_path,
+    invalidate,
     memoize,
 )
 
+_shared_cache = None
+_license_key = compile_path(("license", "key"))
+
+
+def get_shared_cache() -> TTLCache:
+    """Return the process-wide org cache, None when it is disabled"""
+    return _shared_cache
+
+
+def configure_shared_cache(cache: TTLCache = None,
+                           **kwargs) -> TTLCache:
+    """Enable the process-wide org cache.
+    Either pass a ready ``cache`` or keyword arguments for
+    ``TTLCache``. Every client then looks payloads up by
+    ``(org_name, url)`` there before requesting them.
+    """
+    global _shared_cache
+    if cache is None:
+        cache = TTLCache(**kwargs)
+    _shared_cache = cache
+    return cache
+
+
+def disable_shared_cache() -> None:
+    """Stop sharing payloads between clients"""
+    global _shared_cache
+    _shared_cache = None
+
+
+def _cache_key(org_name: str, url: str, project: Callable = None) -> tuple:
+    """Shared cache key of a payload, told apart by its projection"""
+    if project is None:
+        return (org_name, url)
+    return (org_name, url, project.__name__)
+
+
+class RepoRecord(Mapping):
+    """Compact read-only repo keeping only the fields the client uses.
+    It still reads like the repo dict it was built from, e.g.
+    ``repo["name"]`` or ``repo["license"]["key"]``, but keeps neither
+    the URL fields nor ``owner``. Licenses are shared between records.
+    """
+    __slots__ = ("name", "license", "language", "archived", "fork")
+    _FIELDS = frozenset(__slots__)
+    _licenses = {}
+
+    def __init__(self, repo: Mapping) -> None:
+        """Init method of RepoRecord"""
+        for field in self.__slots__:
+            if field in repo:
+                setattr(self, field, repo[field])
+        license = repo.get("license")
+        if isinstance(license, Mapping) and "key" in license:
+            key = license["key"]
+            self.license = self._licenses.get(key)
+            if self.license is None:
+                self.license = self._licenses.setdefault(
+                    key, MappingProxyType({"key": key}))
+
+    def __getitem__(self, key: str) -> object:
+        """Field value, KeyError when not projected or missing"""
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        """Fields present on this record"""
+        return (field for field in self.__slots__ if hasattr(self, field))
+
+    def __len__(self) -> int:
+        """Number of fields present on this record"""
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        """Record as text"""
+        return "RepoRecord({!r})".format(dict(self))
+
+
+def compact_repos(payload: Iterable[Mapping]) -> List[RepoRecord]:
+    """Project a repos payload onto RepoRecord"""
+    return [RepoRecord(repo) for repo in payload]
+
+
+class RepoIndex:
+    """Repo names of a repos payload grouped by facet value.
+    Each facet is built on its first lookup; lookups then cost
+    O(result). Names keep their payload order.
+    """
+    FACETS = {
+        "license": ("license", "key"),
+        "language": ("language",),
+        "archived": ("archived",),
+        "fork": ("fork",),
+    }
+
+    def __init__(self, payload: List[Dict]) -> None:
+        """Init method of RepoIndex"""
+        self.payload = payload
+        self.names = [repo["name"] for repo in payload]
+        self._facets = {}
+
+    def _facet(self, facet: str) -> Dict[object, List[str]]:
+        """Value -> names mapping of facet, built on first use"""
+        groups = self._facets.get(facet)
+        if groups is None:
+            getter = compile_path(self.FACETS[facet])
+            groups = {}
+            for name, repo in zip(self.names, self.payload):
+                try:
+                    value = getter(repo)
+                    groups.setdefault(value, []).append(name)
+                except (KeyError, TypeError):
+                    continue
+            self._facets[facet] = groups
+        return groups
+
+    def lookup(self, facet: str, value: object) -> List[str]:
+        """Names of the repos whose facet equals value"""
+        return list(self._facet(facet).get(value, ()))
+
+    def filter(self, **facets: object) -> List[str]:
+        """Names of the repos matching every given facet value"""
+        if not facets:
+            return list(self.names)
+        groups = sorted((self._facet(facet).get(value, ())
+                         for facet, value in facets.items()), key=len)
+        others = [set(group) for group in groups[1:]]
+        return [name for name in groups[0]
+                if all(name in other for other in others)]
+
+
+def _repos_index(client: object, payload: List[Dict]) -> RepoIndex:
+    """Index of payload kept on client until the payload changes"""
+    index = client.__dict__.get("_repos_index")
+    if index is None or index.payload is not payload:
+        index = client._repos_index = RepoIndex(payload)
+    return index
+
 
 class GithubOrgClient:
     """A Githib org client
+    The memoized ``org`` and ``repos_payload`` never expire by default;
+    long-lived clients can set a TTL with e.g.
+    ``GithubOrgClient.org.ttl = 300`` or drop them with ``invalidate``.
+    With ``compact`` the repos are kept as RepoRecord projections.
     """
     ORG_URL = "https://api.github.com/orgs/{org}"
 
-    def __init__(self, org_name: str) -> None:
+    def __init__(self, org_name: str,
+                 session: requests.Session = None,
+                 cache: LRUResponseCache = None,
+                 compact: bool = False,
+                 decoder: Callable[[bytes], object] = None) -> None:
         """Init method of GithubOrgClient"""
         self._org_name = org_name
+        self._compact = compact
+        self._fetched = set()
+        self._get_json_kwargs = {}
+        if session is not None:
+            self._get_json_kwargs["session"] = session
+        if cache is not None:
+            self._get_json_kwargs["cache"] = cache
+        if decoder is not None:
+            self._get_json_kwargs["decoder"] = decoder
+
+    def _get_json(self, url: str, project: Callable = None) -> Dict:
+        """get_json with the options this client was built with,
+        going through the shared cache when it is enabled.
+        ``project`` is applied before caching. Once this client has
+        fetched a key, fetching it again (after ``invalidate`` or a
+        memoize TTL) skips the shared cache and refreshes it.
+        """
+        cache = _shared_cache
+        key = _cache_key(self._org_name, url, project)
+        if cache is not None and key not in self._fetched:
+            payload = cache.get(key)
+            if payload is not None:
+                self._fetched.add(key)
+                return payload
+        self._fetched.add(key)
+        payload = get_json(url, **self._get_json_kwargs)
+        if project is not None:
+            payload = project(payload)
+        if cache is not None:
+            cache.set(key, payload)
+        return payload
+
+    def invalidate(self, *names: str) -> None:
+        """Drop memoized values, all of them when no names are given"""
+        invalidate(self, *names)
 
     @memoize
     def org(self) -> Dict:
         """Memoize org"""
-        return get_json(self.ORG_URL.format(org=self._org_name))
+        return self._get_json(self.ORG_URL.format(org=self._org_name))
 
     @property
     def _public_repos_url(self) -> str:
@@ -35,11 +237,41 @@ class GithubOrgClient:
     @memoize
     def repos_payload(self) -> Dict:
         """Memoize repos payload"""
-        return get_json(self._public_repos_url)
+        if self._compact:
+            return self._get_json(self._public_repos_url, compact_repos)
+        return self._get_json(self._public_repos_url)
+
+    @property
+    def repos_index(self) -> RepoIndex:
+        """Index of repos_payload, rebuilt when the payload changes"""
+        return _repos_index(self, self.repos_payload)
 
-    def public_repos(self, license: str = None) -> List[str]:
-        """Public repos"""
-        json_payload = self.repos_payload
+    def iter_repos(self) -> Iterator[Dict]:
+        """Stream repos across every page of the repos URL.
+        Each repo is decoded as soon as its bytes have arrived.
+        """
+        repos = iter_json_items(self._public_repos_url,
+                                self._get_json_kwargs.get("session"),
+                                stream=True)
+        return map(RepoRecord, repos) if self._compact else repos
+
+    def filter_repos(self, **facets: object) -> List[str]:
+        """Repos matching every facet, e.g. language="Java", fork=False"""
+        return self.repos_index.filter(**facets)
+
+    def public_repos(self, license: str = None,
+                     stream: bool = False) -> List[str]:
+        """Public repos.
+        The memoized payload is filtered through ``repos_index``; with
+        ``stream`` the repos are filtered while ``iter_repos`` downloads
+        them instead.
+        """
+        if not stream:
+            if license is None:
+                return list(self.repos_index.names)
+            return self.repos_index.lookup("license", license)
+
+        json_payload = self.iter_repos()
         public_repos = [
             repo["name"] for repo in json_payload
             if license is None or self.has_license(repo, license)
@@ -52,7 +284,261 @@ class GithubOrgClient:
         """Static: has_license"""
         assert license_key is not None, "license_key cannot be None"
         try:
-            has_license = access_nested_map(repo, ("license", "key")) == license_key
+            has_license = _license_key(repo) == license_key
         except KeyError:
             return False
-        return has_license
\ No newline at end of file
+        return has_license
+
+
+class AsyncGithubOrgClient:
+    """A Github org client with awaitable lookups.
+    The blocking ``get_json`` calls run on ``executor`` (the loop's
+    default executor when None), so many clients can share one event
+    loop and one pooled session. Concurrent awaits of ``org`` or
+    ``repos_payload`` share a single request. With a ``batcher`` the
+    ``org`` lookups of many clients are coalesced by an ``OrgBatcher``.
+    """
+    ORG_URL = GithubOrgClient.ORG_URL
+
+    def __init__(self, org_name: str,
+                 session: requests.Session = None,
+                 executor: Executor = None,
+                 cache: LRUResponseCache = None,
+                 compact: bool = False,
+                 decoder: Callable[[bytes], object] = None,
+                 batcher: "OrgBatcher" = None) -> None:
+        """Init method of AsyncGithubOrgClient"""
+        self._org_name = org_name
+        self._executor = executor
+        self._batcher = batcher
+        self._fetched = set()
+        self._compact = compact
+        self._get_json_kwargs = {}
+        if session is not None:
+            self._get_json_kwargs["session"] = session
+        if cache is not None:
+            self._get_json_kwargs["cache"] = cache
+        if decoder is not None:
+            self._get_json_kwargs["decoder"] = decoder
+
+    async def _get_json(self, url: str, project: Callable = None) -> Dict:
+        """get_json run off the event loop, going through the shared
+        cache when it is enabled. ``project`` is applied before caching.
+        Refetches skip the shared cache, as in GithubOrgClient.
+        """
+        cache = _shared_cache
+        key = _cache_key(self._org_name, url, project)
+        if cache is not None and key not in self._fetched:
+            payload = cache.get(key)
+            if payload is not None:
+                self._fetched.add(key)
+                return payload
+        self._fetched.add(key)
+        loop = asyncio.get_running_loop()
+        payload = await loop.run_in_executor(
+            self._executor, partial(get_json, url, **self._get_json_kwargs))
+        if project is not None:
+            payload = project(payload)
+        if cache is not None:
+            cache.set(key, payload)
+        return payload
+
+    def invalidate(self, *names: str) -> None:
+        """Drop memoized values, all of them when no names are given"""
+        invalidate(self, *names)
+
+    @async_memoize
+    async def org(self) -> Dict:
+        """Memoize org"""
+        url = self.ORG_URL.format(org=self._org_name)
+        if self._batcher is not None:
+            return await self._batcher.get(url, partial(self._get_json, url))
+        return await self._get_json(url)
+
+    async def _public_repos_url(self) -> str:
+        """Public repos URL"""
+        return (await self.org())["repos_url"]
+
+    @async_memoize
+    async def repos_payload(self) -> Dict:
+        """Memoize repos payload"""
+        url = await self._public_repos_url()
+        if self._compact:
+            return await self._get_json(url, compact_repos)
+        return await self._get_json(url)
+
+    async def repos_index(self) -> RepoIndex:
+        """Index of repos_payload, rebuilt when the payload changes"""
+        return _repos_index(self, await self.repos_payload())
+
+    async def filter_repos(self, **facets: object) -> List[str]:
+        """Repos matching every facet, e.g. language="Java", fork=False"""
+        return (await self.repos_index()).filter(**facets)
+
+    async def iter_repos(self) -> AsyncIterator[Dict]:
+        """Stream repos across every page of the repos URL.
+        The next page is fetched while the current one is consumed.
+        """
+        loop = asyncio.get_running_loop()
+        url = await self._public_repos_url()
+        fetch = partial(get_json_page,
+                        session=self._get_json_kwargs.get("session"))
+        next_page = loop.run_in_executor(self._executor, fetch, url)
+        try:
+            while next_page is not None:
+                page, url = await next_page
+                next_page = None
+                if url is not None:
+                    next_page = loop.run_in_executor(
+                        self._executor, fetch, url)
+                if self._compact:
+                    page = compact_repos(page)
+                for repo in page:
+                    yield repo
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def public_repos(self, license: str = None,
+                           stream: bool = False) -> List[str]:
+        """Public repos.
+        With ``stream`` the repos are read page by page from
+        ``iter_repos`` instead of the memoized first page.
+        """
+        if stream:
+            return [
+                repo["name"] async for repo in self.iter_repos()
+                if license is None
+                or GithubOrgClient.has_license(repo, license)
+            ]
+        index = await self.repos_index()
+        if license is None:
+            return list(index.names)
+        return index.lookup("license", license)
+
+    @classmethod
+    async def fetch_orgs(cls, names: Iterable[str], concurrency: int = 10,
+                         session: requests.Session = None) -> Dict[str, Dict]:
+        """Fetch the org payload of every name with at most
+        ``concurrency`` requests in flight.
+        Duplicate names are fetched once. Give a session whose
+        ``pool_maxsize`` is at least ``concurrency`` to keep every
+        connection alive between requests. When a fetch fails the
+        others are cancelled and the error is raised without waiting
+        for the requests already running.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(concurrency)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+
+        async def fetch(name: str) -> Dict:
+            """Fetch one org under the semaphore"""
+            async with semaphore:
+                return await cls(name, session, executor).org()
+
+        names = list(dict.fromkeys(names))
+        tasks = [asyncio.ensure_future(fetch(name)) for name in names]
+        try:
+            orgs = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # waiting here would block the event loop
+            executor.shutdown(wait=False)
+        return dict(zip(names, orgs))
+
+
+class OrgBatcher:
+    """Coalesce bursts of org lookups into deduplicated batches.
+    Lookups arriving within ``window`` seconds of the first pending one
+    are collected; each distinct URL is then requested once, with at
+    most ``concurrency`` requests in flight, and every waiter gets the
+    result. A lookup of a URL already being requested joins it too.
+    The first lookup of a URL supplies the coroutine function that
+    requests it, so clients keep their own session, cache, decoder,
+    executor and ``ORG_URL``. Use a batcher from a single event loop.
+    Example
+    -------
+    >>> batcher = OrgBatcher(window=0.005, concurrency=4)
+    >>> clients = [AsyncGithubOrgClient(name, batcher=batcher)
+    ...            for name in names]
+    >>> orgs = await asyncio.gather(*(client.org() for client in clients))
+    """
+
+    def __init__(self, window: float = 0.001, concurrency: int = 10,
+                 session: requests.Session = None,
+                 executor: Executor = None) -> None:
+        """Init method of OrgBatcher.
+        ``session`` and ``executor`` serve the lookups made through
+        ``org`` and ``fetch_orgs``.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self._window = window
+        self._concurrency = concurrency
+        self._session = session
+        self._executor = executor
+        self._semaphore = None
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._pending: Dict[str, Callable[[], Awaitable[Dict]]] = {}
+        self._flush = None
+        self._tasks = set()
+        self.lookups = 0
+        self.requests = 0
+
+    async def get(self, url: str,
+                  fetch: Callable[[], Awaitable[Dict]]) -> Dict:
+        """Payload of url, requested with ``fetch`` unless a concurrent
+        lookup of url is already collected or in flight
+        """
+        loop = asyncio.get_running_loop()
+        self.lookups += 1
+        future = self._futures.get(url)
+        if future is None:
+            future = self._futures[url] = loop.create_future()
+            self._pending[url] = fetch
+            if self._flush is None:
+                self._flush = loop.call_later(self._window, self._dispatch)
+        return await asyncio.shield(future)
+
+    async def org(self, org_name: str) -> Dict:
+        """Org payload of org_name, shared with concurrent lookups"""
+        client = AsyncGithubOrgClient(org_name, self._session,
+                                      self._executor)
+        url = client.ORG_URL.format(org=org_name)
+        return await self.get(url, partial(client._get_json, url))
+
+    async def fetch_orgs(self, names: Iterable[str]) -> Dict[str, Dict]:
+        """Org payload of every name, in one batch when issued at once"""
+        names = list(dict.fromkeys(names))
+        orgs = await asyncio.gather(*(self.org(name) for name in names))
+        return dict(zip(names, orgs))
+
+    def _dispatch(self) -> None:
+        """Request every URL collected during the window"""
+        pending, self._pending, self._flush = self._pending, {}, None
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        for url, fetch in pending.items():
+            task = asyncio.ensure_future(self._fetch(url, fetch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, url: str,
+                     fetch: Callable[[], Awaitable[Dict]]) -> None:
+        """Request one URL and hand the outcome to its waiters"""
+        future = self._futures[url]
+        try:
+            async with self._semaphore:
+                self.requests += 1
+                payload = await fetch()
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            future.set_result(payload)
+        finally:
+            # cancelled: the waiters must not hang on the future
+            if not future.done():
+                future.cancel()
+            del self._futures[url]
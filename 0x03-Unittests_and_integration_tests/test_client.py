@@ -3,12 +3,22 @@
 Unittests for the GithubOrgClient class.
 """
 
+import asyncio
+import time
 import unittest
 from unittest import TestCase
-from unittest.mock import patch, PropertyMock
+from unittest.mock import patch, PropertyMock, Mock
 from parameterized import parameterized
-from client import GithubOrgClient
+from client import (
+    GithubOrgClient,
+    AsyncGithubOrgClient,
+    OrgBatcher,
+    RepoRecord,
+    configure_shared_cache,
+    disable_shared_cache,
+)
 from fixtures import TEST_PAYLOAD
+from utils import deep_sizeof
 from urllib.error import HTTPError
 from parameterized import parameterized_class
 
@@ -39,6 +49,388 @@ class TestGithubOrgClient(unittest.TestCase):
 
         self.assertEqual(result, {"login": "mock_org"})
 
+    @patch('client.get_json', return_value={"login": "mock_org"})
+    def test_org_session(self, mock_get_json):
+        """
+        Test that a session given to the client reaches get_json.
+        """
+        session = Mock()
+        client = GithubOrgClient("google", session=session)
+
+        client.org
+
+        mock_get_json.assert_called_once_with(
+            "https://api.github.com/orgs/google", session=session)
+
+    @patch('client.get_json', return_value={"login": "mock_org"})
+    def test_shared_cache(self, mock_get_json):
+        """
+        Test that clients of the same org share one fetch through the
+        shared cache.
+        """
+        cache = configure_shared_cache(maxsize=10)
+        self.addCleanup(disable_shared_cache)
+
+        GithubOrgClient("google").org
+        GithubOrgClient("google").org
+        GithubOrgClient("abc").org
+
+        self.assertEqual(mock_get_json.call_count, 2)
+        self.assertEqual(set(cache.memory_usage()), {
+            ("google", "https://api.github.com/orgs/google"),
+            ("abc", "https://api.github.com/orgs/abc"),
+        })
+
+    def test_public_repos_index(self):
+        """
+        Test that license lookups go through the index, which is
+        rebuilt when the payload changes.
+        """
+        _, repos_payload, expected_repos, apache2_repos = TEST_PAYLOAD[0]
+        with patch.object(GithubOrgClient, 'repos_payload',
+                          new_callable=PropertyMock,
+                          return_value=repos_payload) as mock_payload:
+            client = GithubOrgClient("google")
+
+            with patch.object(GithubOrgClient, 'has_license') as mock_has:
+                self.assertEqual(client.public_repos(), expected_repos)
+                self.assertEqual(client.public_repos("apache-2.0"),
+                                 apache2_repos)
+                self.assertEqual(client.public_repos("bsd-3-clause"),
+                                 ["episodes.dart"])
+                mock_has.assert_not_called()
+            index = client.repos_index
+            self.assertIs(client.repos_index, index)
+
+            mock_payload.return_value = repos_payload[:1]
+            self.assertEqual(client.public_repos(), ["episodes.dart"])
+            self.assertIsNot(client.repos_index, index)
+
+    @patch.object(GithubOrgClient, 'repos_payload',
+                  new_callable=PropertyMock)
+    def test_filter_repos(self, mock_payload):
+        """
+        Test that filter_repos intersects facets.
+        """
+        mock_payload.return_value = [
+            {"name": "a", "language": "Java", "fork": False},
+            {"name": "b", "language": "Java", "fork": True},
+            {"name": "c", "language": "Go", "fork": False},
+            {"name": "d", "fork": False},
+        ]
+        client = GithubOrgClient("google")
+
+        self.assertEqual(client.filter_repos(language="Java", fork=False),
+                         ["a"])
+        self.assertEqual(client.filter_repos(fork=False), ["a", "c", "d"])
+        self.assertEqual(client.filter_repos(archived=True), [])
+
+    def test_public_repos_compact(self):
+        """
+        Test that a compact client filters RepoRecord projections the
+        same way as the raw payload.
+        """
+        org_payload, repos_payload, expected_repos, apache2_repos = \
+            TEST_PAYLOAD[0]
+        with patch('client.get_json',
+                   side_effect=[org_payload, repos_payload]):
+            client = GithubOrgClient("google", compact=True)
+
+            self.assertEqual(client.public_repos(), expected_repos)
+            self.assertEqual(client.public_repos("apache-2.0"),
+                             apache2_repos)
+        self.assertTrue(all(isinstance(repo, RepoRecord)
+                            for repo in client.repos_payload))
+
+    def test_repo_record(self):
+        """
+        Test that RepoRecord reads like the projected repo dict.
+        """
+        repo = TEST_PAYLOAD[0][1][0]
+        record = RepoRecord(repo)
+
+        self.assertEqual(record["name"], repo["name"])
+        self.assertEqual(record["license"]["key"], repo["license"]["key"])
+        self.assertIs(record["license"], RepoRecord(repo)["license"])
+        self.assertTrue(GithubOrgClient.has_license(record, "bsd-3-clause"))
+        with self.assertRaises(KeyError):
+            record["owner"]
+        self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_repo_record_size(self):
+        """
+        Test that deep_sizeof counts the strings a RepoRecord holds.
+        """
+        short = RepoRecord({"name": "r"})
+        long = RepoRecord({"name": "r" * 1000})
+
+        self.assertGreaterEqual(deep_sizeof([long]) - deep_sizeof([short]),
+                                999)
+
+    @patch('client.get_json', return_value={"login": "mock_org"})
+    def test_invalidate(self, mock_get_json):
+        """
+        Test that invalidate("org") makes the next access refetch.
+        """
+        client = GithubOrgClient("google")
+
+        client.org
+        client.invalidate("org")
+        client.org
+
+        self.assertEqual(mock_get_json.call_count, 2)
+
+    @patch('client.get_json')
+    def test_invalidate_shared_cache(self, mock_get_json):
+        """
+        Test that invalidate("org") refetches past the shared cache and
+        refreshes it for the other clients.
+        """
+        mock_get_json.side_effect = [{"login": "old"}, {"login": "new"}]
+        configure_shared_cache(maxsize=10)
+        self.addCleanup(disable_shared_cache)
+        client = GithubOrgClient("google")
+
+        client.org
+        client.invalidate("org")
+
+        self.assertEqual(client.org, {"login": "new"})
+        self.assertEqual(GithubOrgClient("google").org, {"login": "new"})
+        self.assertEqual(mock_get_json.call_count, 2)
+
+    @patch('utils.get_json_page')
+    def test_public_repos_stream(self, mock_get_json_page):
+        """
+        Test that public_repos(stream=True) reads every page.
+        """
+        org_payload, repos_payload, expected_repos, _ = TEST_PAYLOAD[0]
+        mock_get_json_page.side_effect = [
+            (repos_payload[:4], "https://api.github.com/repos?page=2"),
+            (repos_payload[4:], None),
+        ]
+        with patch.object(GithubOrgClient, 'org',
+                          new_callable=PropertyMock,
+                          return_value=org_payload):
+            client = GithubOrgClient("google")
+
+            self.assertEqual(client.public_repos(stream=True),
+                             expected_repos)
+        mock_get_json_page.assert_called_with(
+            "https://api.github.com/repos?page=2", None, True)
+
+
+class TestAsyncGithubOrgClient(unittest.TestCase):
+    """Test cases for the AsyncGithubOrgClient class."""
+
+    @patch('client.get_json')
+    def test_public_repos(self, mock_get_json):
+        """
+        Test that public_repos fetches org and repos once each and
+        filters by license.
+        """
+        org_payload, repos_payload, _, apache2_repos = TEST_PAYLOAD[0]
+        mock_get_json.side_effect = [org_payload, repos_payload]
+        client = AsyncGithubOrgClient("google")
+
+        async def run():
+            return (await client.public_repos("apache-2.0"),
+                    await client.public_repos("apache-2.0"))
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(first, apache2_repos)
+        self.assertEqual(second, apache2_repos)
+        self.assertEqual(mock_get_json.call_count, 2)
+        mock_get_json.assert_called_with(org_payload["repos_url"])
+
+    @patch('client.get_json', return_value={"login": "mock_org"})
+    def test_org_single_flight(self, mock_get_json):
+        """
+        Test that concurrent awaits of org share one request.
+        """
+        client = AsyncGithubOrgClient("google")
+
+        async def run():
+            return await asyncio.gather(client.org(), client.org())
+
+        self.assertEqual(asyncio.run(run()), [{"login": "mock_org"}] * 2)
+        mock_get_json.assert_called_once_with(
+            "https://api.github.com/orgs/google")
+
+    @patch('client.get_json')
+    def test_fetch_orgs(self, mock_get_json):
+        """
+        Test that fetch_orgs resolves every distinct name once.
+        """
+        mock_get_json.side_effect = lambda url: {"url": url}
+
+        orgs = asyncio.run(AsyncGithubOrgClient.fetch_orgs(
+            ["google", "abc", "google"], concurrency=2))
+
+        self.assertEqual(orgs, {
+            "google": {"url": "https://api.github.com/orgs/google"},
+            "abc": {"url": "https://api.github.com/orgs/abc"},
+        })
+        self.assertEqual(mock_get_json.call_count, 2)
+
+    @patch('client.get_json_page')
+    def test_public_repos_stream(self, mock_get_json_page):
+        """
+        Test that the async public_repos(stream=True) reads every page.
+        """
+        org_payload, repos_payload, _, apache2_repos = TEST_PAYLOAD[0]
+        mock_get_json_page.side_effect = [
+            (repos_payload[:4], "https://api.github.com/repos?page=2"),
+            (repos_payload[4:], None),
+        ]
+        client = AsyncGithubOrgClient("google")
+        client._org = org_payload
+
+        result = asyncio.run(client.public_repos("apache-2.0", stream=True))
+
+        self.assertEqual(result, apache2_repos)
+        self.assertEqual(mock_get_json_page.call_count, 2)
+
+    @patch('client.get_json')
+    def test_fetch_orgs_error(self, mock_get_json):
+        """
+        Test that a failing fetch cancels the others and is raised
+        without waiting for the requests still running.
+        """
+        def get_json(url):
+            if url.endswith("/bad"):
+                raise HTTPError(url, 404, "Not Found", None, None)
+            time.sleep(0.5)
+            return {"url": url}
+
+        mock_get_json.side_effect = get_json
+
+        async def run():
+            start = time.perf_counter()
+            with self.assertRaises(HTTPError):
+                await AsyncGithubOrgClient.fetch_orgs(
+                    ["slow", "bad", "other", "late"], concurrency=2)
+            return time.perf_counter() - start
+
+        self.assertLess(asyncio.run(run()), 0.4)
+        self.assertNotIn(
+            ("https://api.github.com/orgs/late",), [
+                call.args for call in mock_get_json.call_args_list])
+
+    def test_fetch_orgs_concurrency(self):
+        """
+        Test that fetch_orgs rejects a non-positive concurrency.
+        """
+        with self.assertRaises(ValueError):
+            asyncio.run(AsyncGithubOrgClient.fetch_orgs(["google"], 0))
+
+
+class TestOrgBatcher(unittest.TestCase):
+    """Test cases for the OrgBatcher class."""
+
+    @patch('client.get_json')
+    def test_coalesce(self, mock_get_json):
+        """
+        Test that concurrent lookups of clients sharing a batcher are
+        deduplicated and fanned out to every waiter.
+        """
+        mock_get_json.side_effect = lambda url: {"url": url}
+        batcher = OrgBatcher(window=0.01, concurrency=2)
+
+        async def run():
+            clients = [AsyncGithubOrgClient(name, batcher=batcher)
+                       for name in ["google", "abc", "google", "abc"]]
+            return await asyncio.gather(*(c.org() for c in clients))
+
+        orgs = asyncio.run(run())
+
+        self.assertEqual([org["url"] for org in orgs], [
+            "https://api.github.com/orgs/google",
+            "https://api.github.com/orgs/abc",
+        ] * 2)
+        self.assertEqual(mock_get_json.call_count, 2)
+        self.assertEqual((batcher.lookups, batcher.requests), (4, 2))
+
+    @patch('client.get_json')
+    def test_client_options(self, mock_get_json):
+        """
+        Test that a batched client keeps its own ORG_URL and session.
+        """
+        mock_get_json.side_effect = lambda url, session: {"url": url}
+        session = Mock()
+        stub = type("StubClient", (AsyncGithubOrgClient,),
+                    {"ORG_URL": "http://stub/orgs/{org}"})
+        batcher = OrgBatcher(window=0)
+
+        org = asyncio.run(stub("abc", session, batcher=batcher).org())
+
+        self.assertEqual(org, {"url": "http://stub/orgs/abc"})
+        mock_get_json.assert_called_once_with(
+            "http://stub/orgs/abc", session=session)
+
+    def test_cancelled_fetch(self):
+        """
+        Test that cancelling a request cancels its waiters instead of
+        leaving them waiting.
+        """
+        batcher = OrgBatcher(window=0)
+
+        async def fetch():
+            await asyncio.sleep(10)
+
+        async def run():
+            waiters = asyncio.gather(
+                batcher.get("http://a", fetch),
+                batcher.get("http://a", fetch), return_exceptions=True)
+            await asyncio.sleep(0.01)
+            for task in batcher._tasks:
+                task.cancel()
+            return await asyncio.wait_for(waiters, 1)
+
+        results = asyncio.run(run())
+
+        self.assertTrue(all(isinstance(result, asyncio.CancelledError)
+                            for result in results))
+        self.assertEqual(batcher._futures, {})
+
+    @patch('client.get_json', side_effect=HTTPError(
+        "https://api.github.com/orgs/nope", 404, "Not Found", None, None))
+    def test_error_fan_out(self, mock_get_json):
+        """
+        Test that a failed request fails every waiter and is not kept.
+        """
+        batcher = OrgBatcher(window=0)
+
+        async def run():
+            return await asyncio.gather(
+                batcher.org("nope"), batcher.org("nope"),
+                return_exceptions=True)
+
+        errors = asyncio.run(run())
+
+        self.assertTrue(all(isinstance(e, HTTPError) for e in errors))
+        mock_get_json.assert_called_once()
+        self.assertEqual(batcher._futures, {})
+
+    @patch('client.get_json')
+    def test_fetch_orgs(self, mock_get_json):
+        """
+        Test that fetch_orgs maps every distinct name to its org.
+        """
+        mock_get_json.side_effect = lambda url: {"url": url}
+
+        orgs = asyncio.run(OrgBatcher().fetch_orgs(["abc", "abc"]))
+
+        self.assertEqual(orgs, {
+            "abc": {"url": "https://api.github.com/orgs/abc"}})
+
+    def test_concurrency(self):
+        """
+        Test that OrgBatcher rejects a non-positive concurrency.
+        """
+        with self.assertRaises(ValueError):
+            OrgBatcher(concurrency=0)
+
 
 if __name__ == "__main__":
     unittest.main()
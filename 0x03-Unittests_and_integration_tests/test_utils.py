@@ -7,10 +7,39 @@ access_nested_map function, ensuring proper functionality
 and correct behavior under various conditions.
 """
 
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch, Mock
 from parameterized import parameterized
-from utils import memoize, access_nested_map, get_json
+from utils import (
+    CachedResponse,
+    DiskResponseCache,
+    LRUResponseCache,
+    TTLCache,
+    deep_sizeof,
+    memoize,
+    async_memoize,
+    access_nested_map,
+    compile_path,
+    extract_path,
+    get_json,
+    make_session,
+    configure_session,
+    configure_json_decoder,
+    detect_json_decoder,
+    get_json_decoder,
+    get_session,
+    invalidate,
+    iter_json_array,
+    iter_json_items,
+    iter_json_pages,
+)
 
 
 class TestAccessNestedMap(unittest.TestCase):
@@ -60,6 +89,52 @@ class TestAccessNestedMap(unittest.TestCase):
         self.assertEqual(str(context.exception), repr(path[-1]))
 
 
+class TestCompilePath(unittest.TestCase):
+    """
+    Tests for the compile_path and extract_path functions.
+    """
+
+    @parameterized.expand([
+        ({"a": 1}, ("a",), 1),
+        ({"a": {"b": 2}}, ("a",), {"b": 2}),
+        ({"a": {"b": 2}}, ("a", "b"), 2),
+        ({"a": 1}, (), {"a": 1}),
+    ])
+    def test_compile_path(self, nested_map: dict, path: tuple,
+                          expected: any) -> None:
+        """
+        Tests that the getter matches access_nested_map.
+        """
+        self.assertEqual(compile_path(path)(nested_map), expected)
+
+    @parameterized.expand([
+        ({}, ("a",)),
+        ({"a": 1}, ("a", "b")),
+        ({"a": [1]}, ("a", 0)),
+    ])
+    def test_compile_path_exception(self, nested_map: dict,
+                                    path: tuple) -> None:
+        """
+        Tests that the getter raises the same KeyError.
+        """
+        with self.assertRaises(KeyError) as context:
+            compile_path(path)(nested_map)
+        self.assertEqual(str(context.exception), repr(path[-1]))
+
+    def test_extract_path(self) -> None:
+        """
+        Tests batch extraction with and without a default.
+        """
+        maps = [{"a": {"b": 1}}, {"a": None}, {"a": {"b": 3}}]
+
+        self.assertEqual(extract_path(maps, ("a", "b"), default=None),
+                         [1, None, 3])
+        with self.assertRaises(KeyError):
+            extract_path(maps, ("a", "b"))
+        self.assertEqual(extract_path(maps[:1], compile_path(("a",))),
+                         [{"b": 1}])
+
+
 class TestGetJson(unittest.TestCase):
     """
     Tests for the get_json function.
@@ -81,9 +156,10 @@ class TestGetJson(unittest.TestCase):
             test_url (str): The URL to test.
             test_payload (dict): The expected JSON payload.
         """
-        with patch('utils.requests.get') as mock_get:
+        with patch('utils.get_session') as mock_get_session:
+            mock_get = mock_get_session.return_value.get
             mock_response = Mock()
-            mock_response.json.return_value = test_payload
+            mock_response.content = json.dumps(test_payload).encode()
             mock_get.return_value = mock_response
 
             result = get_json(test_url)
@@ -91,6 +167,343 @@ class TestGetJson(unittest.TestCase):
             mock_get.assert_called_once_with(test_url)
             self.assertEqual(result, test_payload)
 
+    def test_get_json_session(self) -> None:
+        """
+        Tests that get_json uses the session it is given instead of
+        the process-wide one.
+        """
+        session = Mock()
+        session.get.return_value.content = b'{"payload": true}'
+        with patch('utils.get_session') as mock_get_session:
+            result = get_json("http://example.com", session=session)
+
+            mock_get_session.assert_not_called()
+        session.get.assert_called_once_with("http://example.com")
+        self.assertEqual(result, {"payload": True})
+
+
+class TestJsonDecoder(unittest.TestCase):
+    """
+    Tests for the pluggable JSON decoder.
+    """
+
+    def test_detect_fallback(self) -> None:
+        """
+        Tests that the json module is used when no faster decoder is
+        installed.
+        """
+        with patch.dict('sys.modules', {"orjson": None, "ujson": None}):
+            self.assertIs(detect_json_decoder(), json.loads)
+
+    def test_configure_json_decoder(self) -> None:
+        """
+        Tests that get_json decodes the body with the configured
+        decoder unless one is passed.
+        """
+        self.addCleanup(configure_json_decoder)
+        session = Mock()
+        session.get.return_value.content = b"[1]"
+        decoder = Mock(return_value=["configured"])
+        configure_json_decoder(decoder)
+
+        self.assertIs(get_json_decoder(), decoder)
+        self.assertEqual(get_json("http://a", session), ["configured"])
+        decoder.assert_called_once_with(b"[1]")
+        self.assertEqual(get_json("http://a", session, decoder=json.loads),
+                         [1])
+
+
+class TestConditionalGetJson(unittest.TestCase):
+    """
+    Tests for get_json with a response cache.
+    """
+
+    @staticmethod
+    def response(status_code: int, payload=None, headers=None) -> Mock:
+        """
+        Builds a response mock.
+        """
+        response = Mock(status_code=status_code, headers=headers or {})
+        response.content = json.dumps(payload).encode()
+        return response
+
+    def test_not_modified(self) -> None:
+        """
+        Tests that validators are sent back and a 304 is served from
+        the cache without decoding.
+        """
+        cache = LRUResponseCache()
+        session = Mock()
+        first = self.response(200, {"payload": True}, {
+            "ETag": '"abc"', "Last-Modified": "Sat, 01 Jan 2000"})
+        second = self.response(304)
+        session.get.side_effect = [first, second]
+
+        decoder = Mock(wraps=json.loads)
+        get_json("http://a", session, cache, decoder=decoder)
+        result = get_json("http://a", session, cache, decoder=decoder)
+
+        session.get.assert_called_with("http://a", headers={
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Sat, 01 Jan 2000",
+        })
+        decoder.assert_called_once_with(first.content)
+        self.assertEqual(result, {"payload": True})
+
+    def test_no_validators(self) -> None:
+        """
+        Tests that responses without validators are not cached.
+        """
+        cache = LRUResponseCache()
+        session = Mock()
+        session.get.return_value = self.response(200, {"payload": True})
+
+        get_json("http://a", session, cache)
+
+        self.assertIsNone(cache.get("http://a"))
+
+    def test_lru_eviction(self) -> None:
+        """
+        Tests that the least recently used URL is evicted.
+        """
+        cache = LRUResponseCache(maxsize=2)
+        cache.set("a", CachedResponse("1", None, 1))
+        cache.set("b", CachedResponse("2", None, 2))
+        cache.get("a")
+        cache.set("c", CachedResponse("3", None, 3))
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a").payload, 1)
+
+    def test_disk_cache(self) -> None:
+        """
+        Tests that a new disk cache on the same directory sees the
+        entries of the previous one.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            entry = CachedResponse('"abc"', None, {"payload": [1, 2]})
+            DiskResponseCache(directory).set("http://a", entry)
+
+            cache = DiskResponseCache(directory)
+
+            self.assertEqual(cache.get("http://a"), entry)
+            self.assertIsNone(cache.get("http://b"))
+            cache.clear()
+            self.assertIsNone(DiskResponseCache(directory).get("http://a"))
+
+    def test_clear_keeps_other_files(self) -> None:
+        """
+        Tests that clear removes only cache entries and interrupted
+        writes from a shared directory.
+        """
+        entry = CachedResponse('"v1"', None, {"login": "google"})
+        with tempfile.TemporaryDirectory() as directory:
+            cache = DiskResponseCache(directory)
+            cache.set("http://a", entry)
+            for name in ("config.json", ".leftover.etag.tmp"):
+                open(os.path.join(directory, name), "w").close()
+
+            cache.clear()
+
+            self.assertEqual(os.listdir(directory), ["config.json"])
+
+
+class TestTTLCache(unittest.TestCase):
+    """
+    Tests for the TTLCache class.
+    """
+
+    def test_ttl(self) -> None:
+        """
+        Tests that entries expire after the TTL.
+        """
+        cache = TTLCache(ttl=10)
+        with patch('utils.time.monotonic', return_value=100):
+            cache.set("a", 1)
+        with patch('utils.time.monotonic', return_value=109):
+            self.assertEqual(cache.get("a"), 1)
+        with patch('utils.time.monotonic', return_value=110):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru(self) -> None:
+        """
+        Tests that the least recently used key is evicted.
+        """
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.pop("a"), 1)
+        self.assertEqual(list(cache.memory_usage()), ["c"])
+
+    def test_memory_usage(self) -> None:
+        """
+        Tests that sizes account for nested containers once.
+        """
+        shared = ["x" * 100]
+        payload = {"a": shared, "b": shared}
+        cache = TTLCache()
+        cache.set("k", payload)
+
+        self.assertEqual(cache.memory_usage(), {"k": deep_sizeof(payload)})
+        self.assertLess(deep_sizeof(payload),
+                        deep_sizeof({"a": ["x" * 100], "b": ["y" * 100]}))
+
+    def test_memory_usage_slots(self) -> None:
+        """
+        Tests that sizes include what the slots of compact objects hold.
+        """
+        class Point:
+            __slots__ = ("x", "y")
+
+        point = Point()
+        point.x = "x" * 1000
+
+        self.assertGreater(deep_sizeof(point),
+                           sys.getsizeof(point) + 1000)
+
+
+class TestPagination(unittest.TestCase):
+    """
+    Tests for the paginated JSON helpers.
+    """
+
+    @staticmethod
+    def paged_session(pages: dict) -> Mock:
+        """
+        Builds a session serving ``pages`` as url -> (payload, next).
+        """
+        def get(url):
+            payload, next_url = pages[url]
+            response = Mock()
+            response.content = json.dumps(payload).encode()
+            response.links = {"next": {"url": next_url}} if next_url else {}
+            return response
+
+        session = Mock()
+        session.get.side_effect = get
+        return session
+
+    def test_iter_json_pages(self) -> None:
+        """
+        Tests that pages are followed through rel="next" links.
+        """
+        session = self.paged_session({
+            "http://a/1": ([1, 2], "http://a/2"),
+            "http://a/2": ([3], None),
+        })
+
+        pages = iter_json_pages("http://a/1", session)
+
+        self.assertEqual(next(pages), [1, 2])
+        session.get.assert_called_once_with("http://a/1")
+        self.assertEqual(list(pages), [[3]])
+        self.assertEqual(session.get.call_count, 2)
+
+    def test_iter_json_items(self) -> None:
+        """
+        Tests that items are flattened across pages.
+        """
+        session = self.paged_session({
+            "http://a/1": ([1, 2], "http://a/2"),
+            "http://a/2": ([], "http://a/3"),
+            "http://a/3": ([3], None),
+        })
+
+        self.assertEqual(list(iter_json_items("http://a/1", session)),
+                         [1, 2, 3])
+
+
+class TestStreamingJson(unittest.TestCase):
+    """
+    Tests for incremental JSON array decoding.
+    """
+
+    PAYLOAD = [{"a": 1, "s": "\u00e9t\u00e9"}, [1.5, None], 12345,
+               2.5e-3, "x", True]
+
+    @parameterized.expand([(1,), (2,), (5,), (1000,)])
+    def test_iter_json_array(self, size: int) -> None:
+        """
+        Tests that any chunking decodes to the same elements.
+        """
+        text = json.dumps(self.PAYLOAD, ensure_ascii=False).encode()
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+
+        self.assertEqual(list(iter_json_array(chunks)), self.PAYLOAD)
+
+    def test_iter_json_array_lazy(self) -> None:
+        """
+        Tests that elements are yielded before the input is exhausted.
+        """
+        def chunks():
+            yield '[{"a": 1}, '
+            raise AssertionError("read past the first element")
+
+        self.assertEqual(next(iter_json_array(chunks())), {"a": 1})
+
+    @parameterized.expand([("[1",), ("{}",), ("[1 2]",), ("[1,]",)])
+    def test_iter_json_array_invalid(self, text: str) -> None:
+        """
+        Tests that malformed arrays raise a JSONDecodeError.
+        """
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array([text]))
+
+    def test_get_json_stream(self) -> None:
+        """
+        Tests that get_json(stream=True) decodes the streamed body and
+        closes the response.
+        """
+        session = Mock()
+        response = session.get.return_value
+        response.iter_content.return_value = [b'[{"a"', b': 1}, 2]']
+
+        result = get_json("http://a", session, stream=True)
+
+        self.assertEqual(list(result), [{"a": 1}, 2])
+        session.get.assert_called_once_with("http://a", stream=True)
+        response.close.assert_called_once()
+        with self.assertRaises(ValueError):
+            get_json("http://a", session, LRUResponseCache(), stream=True)
+
+
+class TestSession(unittest.TestCase):
+    """
+    Tests for the pooled session helpers.
+    """
+
+    def test_make_session(self) -> None:
+        """
+        Tests that both schemes share one adapter with the pool sizes.
+        """
+        session = make_session(pool_connections=3, pool_maxsize=7)
+        adapter = session.get_adapter("https://api.github.com")
+
+        self.assertIs(adapter, session.get_adapter("http://example.com"))
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+        session.close()
+
+    def test_configure_session(self) -> None:
+        """
+        Tests that configure_session replaces and closes the shared
+        session.
+        """
+        previous = get_session()
+        self.addCleanup(configure_session)
+        with patch.object(previous, 'close') as mock_close:
+            session = configure_session(pool_maxsize=2)
+
+            mock_close.assert_called_once()
+        self.assertIs(get_session(), session)
+        self.assertIsNot(session, previous)
+
 
 class TestMemoize(unittest.TestCase):
     """
@@ -130,6 +543,169 @@ class TestMemoize(unittest.TestCase):
             self.assertEqual(result1, 42)
             self.assertEqual(result2, 42)
 
+    def make_class(self, **kwargs) -> type:
+        """
+        Builds a class with a memoized property counting its calls.
+        """
+        class TestClass:
+            calls = 0
+
+            @memoize(**kwargs)
+            def a_property(self) -> int:
+                """Returns the number of calls so far."""
+                type(self).calls += 1
+                return type(self).calls
+
+        return TestClass
+
+    def test_memoize_ttl(self) -> None:
+        """
+        Tests that a value is recomputed once its TTL has passed.
+        """
+        TestClass = self.make_class(ttl=10)
+        test_instance = TestClass()
+
+        with patch('utils.time.monotonic', return_value=100):
+            self.assertEqual(test_instance.a_property, 1)
+        with patch('utils.time.monotonic', return_value=109):
+            self.assertEqual(test_instance.a_property, 1)
+        with patch('utils.time.monotonic', return_value=110):
+            self.assertEqual(test_instance.a_property, 2)
+
+        stats = TestClass.a_property.stats
+        self.assertEqual((stats.hits, stats.misses, stats.evictions),
+                         (1, 2, 1))
+
+    def test_memoize_maxsize(self) -> None:
+        """
+        Tests that only maxsize instances keep their value.
+        """
+        TestClass = self.make_class(maxsize=1)
+        first, second = TestClass(), TestClass()
+
+        first.a_property
+        second.a_property
+
+        self.assertFalse(hasattr(first, "_a_property"))
+        self.assertEqual(second._a_property, 2)
+        self.assertEqual(TestClass.a_property.stats.evictions, 1)
+
+    def test_invalidate(self) -> None:
+        """
+        Tests that invalidate drops named or all memoized values and
+        rejects unknown names.
+        """
+        TestClass = self.make_class()
+        test_instance = TestClass()
+
+        test_instance.a_property
+        invalidate(test_instance, "a_property")
+        self.assertEqual(test_instance.a_property, 2)
+        invalidate(test_instance)
+        self.assertEqual(test_instance.a_property, 3)
+        with self.assertRaises(ValueError):
+            invalidate(test_instance, "calls")
+
+    def test_memoize_single_flight(self) -> None:
+        """
+        Tests that threads racing on a cold property share one call.
+        """
+        calls = []
+        barrier = threading.Barrier(8)
+
+        class TestClass:
+            @memoize
+            def a_property(self) -> int:
+                """Returns after a short delay."""
+                calls.append(None)
+                time.sleep(0.05)
+                return 42
+
+        test_instance = TestClass()
+        results = []
+
+        def read() -> None:
+            barrier.wait()
+            results.append(test_instance.a_property)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [42] * 8)
+
+
+class TestAsyncMemoize(unittest.TestCase):
+    """
+    Tests for the async_memoize decorator.
+    """
+
+    def make_instance(self, **kwargs):
+        """
+        Builds an instance whose memoized coroutine counts its calls.
+        """
+        class TestClass:
+            calls = 0
+
+            @async_memoize(**kwargs)
+            async def a_method(self) -> int:
+                """Returns the number of calls after a short delay."""
+                type(self).calls += 1
+                await asyncio.sleep(0.01)
+                return type(self).calls
+
+        return TestClass()
+
+    def test_single_flight(self) -> None:
+        """
+        Tests that concurrent awaits share one call and later awaits
+        hit the cache.
+        """
+        test_instance = self.make_instance()
+
+        async def run():
+            first = await asyncio.gather(
+                *(test_instance.a_method() for _ in range(5)))
+            return first, await test_instance.a_method()
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(first, [1] * 5)
+        self.assertEqual(second, 1)
+        self.assertEqual(type(test_instance).a_method.stats.misses, 1)
+
+    def test_cancelled_awaiter(self) -> None:
+        """
+        Tests that cancelling one awaiter leaves the call running for
+        the others.
+        """
+        test_instance = self.make_instance()
+
+        async def run():
+            cancelled = asyncio.ensure_future(test_instance.a_method())
+            waiting = asyncio.ensure_future(test_instance.a_method())
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            return await waiting
+
+        self.assertEqual(asyncio.run(run()), 1)
+
+    def test_invalidate(self) -> None:
+        """
+        Tests that invalidate makes the next await call again.
+        """
+        test_instance = self.make_instance()
+
+        async def run():
+            await test_instance.a_method()
+            invalidate(test_instance, "a_method")
+            return await test_instance.a_method()
+
+        self.assertEqual(asyncio.run(run()), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,22 +1,81 @@
 #!/usr/bin/env python3
 """Generic utilities for github org client.
 """
+import asyncio
+import codecs
+import hashlib
+import importlib
+import itertools
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
 import requests
+from requests.adapters import HTTPAdapter
 from functools import wraps
+from types import MethodType
 from typing import (
     Mapping,
     Sequence,
     Any,
     Dict,
     Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
 )
 
 __all__ = [
+    "AsyncMemoizedMethod",
+    "CachedResponse",
+    "DiskResponseCache",
+    "LRUResponseCache",
+    "MemoizeStats",
+    "MemoizedProperty",
+    "TTLCache",
     "access_nested_map",
+    "async_memoize",
+    "compile_path",
+    "configure_json_decoder",
+    "configure_session",
+    "deep_sizeof",
+    "detect_json_decoder",
+    "extract_path",
     "get_json",
+    "get_json_decoder",
+    "get_json_page",
+    "get_session",
+    "invalidate",
+    "iter_json_array",
+    "iter_json_items",
+    "iter_json_pages",
+    "make_session",
     "memoize",
 ]
 
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_CACHE_SIZE = 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_session = None
+_session_lock = threading.Lock()
+_json_decoder = None
+
+_MISSING = object()
+_DEADLINES = "_memoize_deadlines"
+_IN_FLIGHT = "_memoize_in_flight"
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
 
 def access_nested_map(nested_map: Mapping, path: Sequence) -> Any:
     """Access nested map with key path.
@@ -40,15 +99,663 @@ def access_nested_map(nested_map: Mapping, path: Sequence) -> Any:
     return nested_map
 
 
-def get_json(url: str) -> Dict:
+def compile_path(path: Sequence) -> Callable[[Mapping], Any]:
+    """Compile a key path into a reusable getter.
+    The getter behaves like ``access_nested_map(nested_map, path)``,
+    including the KeyError for missing keys and non-mapping levels,
+    but the path is converted once and plain dicts skip the Mapping
+    ABC check.
+    Example
+    -------
+    >>> license_key = compile_path(("license", "key"))
+    >>> license_key({"license": {"key": "mit"}})
+    'mit'
+    """
+    path = tuple(path)
+
+    def getter(nested_map: Mapping) -> Any:
+        """Value at the compiled path of nested_map"""
+        for key in path:
+            if (nested_map.__class__ is not dict
+                    and not isinstance(nested_map, Mapping)):
+                raise KeyError(key)
+            nested_map = nested_map[key]
+        return nested_map
+
+    getter.path = path
+    return getter
+
+
+def extract_path(nested_maps: Iterable[Mapping], path: Sequence,
+                 default: Any = _MISSING) -> List[Any]:
+    """Value at path of every map, in one pass.
+    ``path`` may also be a getter from ``compile_path``. Maps missing
+    the path raise KeyError, or give ``default`` when one is passed.
+    Example
+    -------
+    >>> extract_path(repos, ("license", "key"), default=None)
+    ['mit', None, 'apache-2.0']
+    """
+    getter = path if callable(path) else compile_path(path)
+    if default is _MISSING:
+        return [getter(nested_map) for nested_map in nested_maps]
+    values = []
+    for nested_map in nested_maps:
+        try:
+            values.append(getter(nested_map))
+        except KeyError:
+            values.append(default)
+    return values
+
+
+def make_session(pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 pool_block: bool = False,
+                 max_retries: int = 0) -> requests.Session:
+    """Build a keep-alive session with per-host connection pools.
+    Parameters
+    ----------
+    pool_connections: int
+        number of per-host pools kept alive
+    pool_maxsize: int
+        maximum number of connections kept in each host pool
+    pool_block: bool
+        block when a pool is exhausted instead of opening extra
+        throw-away connections
+    max_retries: int
+        retries for failed connections
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          pool_block=pool_block,
+                          max_retries=max_retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session used by get_json, creating it
+    with the default pool sizes on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = make_session()
+    return _session
+
+
+def configure_session(session: requests.Session = None,
+                      **kwargs: Any) -> requests.Session:
+    """Replace the process-wide session.
+    Either pass a ready ``session`` or keyword arguments for
+    ``make_session``. The previous session is closed.
+    """
+    global _session
+    if session is None:
+        session = make_session(**kwargs)
+    with _session_lock:
+        previous, _session = _session, session
+    if previous is not None and previous is not session:
+        previous.close()
+    return session
+
+
+def detect_json_decoder() -> Callable[[bytes], Any]:
+    """Fastest installed ``loads``: orjson, then ujson, then json"""
+    for module_name in ("orjson", "ujson"):
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        return module.loads
+    return json.loads
+
+
+def get_json_decoder() -> Callable[[bytes], Any]:
+    """Return the decoder used by get_json, detecting it on first use"""
+    global _json_decoder
+    if _json_decoder is None:
+        _json_decoder = detect_json_decoder()
+    return _json_decoder
+
+
+def configure_json_decoder(decoder: Callable[[bytes], Any] = None
+                           ) -> Callable[[bytes], Any]:
+    """Set the decoder used by get_json.
+    ``decoder`` takes the raw body bytes and returns the decoded
+    object; None picks ``detect_json_decoder()`` again.
+    """
+    global _json_decoder
+    _json_decoder = decoder or detect_json_decoder()
+    return _json_decoder
+
+
+class CachedResponse(NamedTuple):
+    """Validators and decoded body of a cacheable response"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    payload: Any
+
+
+class LRUResponseCache:
+    """Bounded in-memory response cache keyed by URL.
+    The least recently used entry is dropped once ``maxsize`` URLs
+    are stored.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        """Init method of LRUResponseCache"""
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached URLs"""
+        return len(self._entries)
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Cached response for url, or None"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def set(self, url: str, entry: CachedResponse) -> None:
+        """Store the response for url"""
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskResponseCache(LRUResponseCache):
+    """LRU response cache backed by one JSON file per URL.
+    Entries missing from memory are loaded from ``directory``, so a
+    restarted process can still send conditional requests. Entry files
+    are named ``<sha256 of the URL>.etag.json``; ``clear`` only removes
+    those and interrupted writes, so the directory may be shared.
+    """
+    _ENTRY_NAME = re.compile(r"[0-9a-f]{64}\.etag\.json|\..*\.etag\.tmp")
+
+    def __init__(self, directory: str,
+                 maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        """Init method of DiskResponseCache"""
+        super().__init__(maxsize)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        """File holding the entry of url"""
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, digest + ".etag.json")
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Cached response for url, from memory or disk"""
+        entry = super().get(url)
+        if entry is not None:
+            return entry
+        try:
+            with open(self._path(url)) as file:
+                entry = CachedResponse(**json.load(file))
+        except (OSError, ValueError, TypeError):
+            return None
+        super().set(url, entry)
+        return entry
+
+    def set(self, url: str, entry: CachedResponse) -> None:
+        """Store the response for url in memory and on disk"""
+        super().set(url, entry)
+        fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".etag.tmp",
+                                        dir=self.directory)
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(entry._asdict(), file)
+            os.replace(tmp_path, self._path(url))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def clear(self) -> None:
+        """Drop every entry from memory and disk"""
+        super().clear()
+        for name in os.listdir(self.directory):
+            if self._ENTRY_NAME.fullmatch(name):
+                os.unlink(os.path.join(self.directory, name))
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Approximate memory in bytes held by obj and what it contains.
+    Containers are walked, and so are the ``__slots__`` of compact
+    objects such as ``RepoRecord``. Objects reachable more than once
+    are counted once.
+    """
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, Mapping):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        for cls in type(item).__mro__:
+            slots = cls.__dict__.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            for slot in slots:
+                value = getattr(item, slot, _MISSING)
+                if value is not _MISSING and slot != "__weakref__":
+                    stack.append(value)
+    return size
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after ``ttl``
+    seconds. The size of each value is measured once when it is
+    stored, see ``memory_usage``.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE,
+                 ttl: float = None) -> None:
+        """Init method of TTLCache"""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of entries, expired ones included"""
+        return len(self._entries)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Value stored under key, default when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, deadline, _ = entry
+            if deadline is not None and time.monotonic() >= deadline:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store value under key"""
+        deadline = None
+        if self.ttl is not None:
+            deadline = time.monotonic() + self.ttl
+        size = deep_sizeof(value)
+        with self._lock:
+            self._entries[key] = (value, deadline, size)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        """Remove and return the value stored under key"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def memory_usage(self) -> Dict[Any, int]:
+        """Approximate size in bytes of each stored value"""
+        with self._lock:
+            return {key: entry[2] for key, entry in self._entries.items()}
+
+
+def iter_json_array(chunks: Iterable[Any]) -> Iterator[Any]:
+    """Decode a JSON array incrementally, yielding each element as
+    soon as its text is complete.
+    ``chunks`` are the array text split anywhere, as bytes (UTF-8) or
+    str. Only the element being decoded is buffered.
+    Example
+    -------
+    >>> list(iter_json_array([b'[{"a": 1}, {"a"', b': 2}]']))
+    [{'a': 1}, {'a': 2}]
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos = "", 0
+    expect = "["
+    wait_for = 0
+    for chunk in itertools.chain(chunks, [None]):
+        eof = chunk is None
+        if eof:
+            chunk = utf8.decode(b"", final=True)
+        elif isinstance(chunk, bytes):
+            chunk = utf8.decode(chunk)
+        buffer, pos = buffer[pos:] + chunk, 0
+        if not eof and len(buffer) < wait_for:
+            continue
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if expect == "[":
+                if char != "[":
+                    raise json.JSONDecodeError("Expecting '['", buffer, pos)
+                expect = "first"
+                pos += 1
+            elif char == "]" and expect in ("first", ","):
+                return
+            elif expect == ",":
+                if char != ",":
+                    raise json.JSONDecodeError("Expecting ','", buffer, pos)
+                expect = "item"
+                pos += 1
+            else:
+                try:
+                    item, end = _JSON_DECODER.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    wait_for = 2 * (len(buffer) - pos)
+                    break
+                if not eof and (end == len(buffer) or buffer[end] in ".eE"):
+                    # a number may go on in the next chunk
+                    wait_for = len(buffer) - pos + 1
+                    break
+                yield item
+                expect, pos, wait_for = ",", end, 0
+    raise json.JSONDecodeError("Unterminated array", buffer, pos)
+
+
+def _iter_response_items(response: requests.Response) -> Iterator[Any]:
+    """Elements of the JSON array streamed in response"""
+    try:
+        yield from iter_json_array(
+            response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+    finally:
+        response.close()
+
+
+def get_json(url: str, session: requests.Session = None,
+             cache: LRUResponseCache = None, stream: bool = False,
+             decoder: Callable[[bytes], Any] = None) -> Any:
     """Get JSON from remote URL.
+    Connections are reused through ``session``, or through the
+    process-wide session when none is given.
+    With a ``cache`` the request carries If-None-Match /
+    If-Modified-Since from the last response, and a 304 returns the
+    cached payload without decoding anything. The cached payload is
+    shared between callers and must not be mutated.
+    With ``stream`` the body must be a JSON array; an iterator over its
+    elements is returned and they are decoded as the download goes.
+    The body is decoded with ``decoder``, by default the one from
+    ``get_json_decoder``; streamed bodies always use the json module.
+    """
+    if session is None:
+        session = get_session()
+    if stream:
+        if cache is not None:
+            raise ValueError("stream cannot be used with a cache")
+        return _iter_response_items(session.get(url, stream=True))
+    if decoder is None:
+        decoder = get_json_decoder()
+    if cache is None:
+        return decoder(session.get(url).content)
+
+    entry = cache.get(url)
+    headers = {}
+    if entry is not None:
+        if entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+    response = session.get(url, headers=headers)
+    if response.status_code == 304 and entry is not None:
+        return entry.payload
+
+    payload = decoder(response.content)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag is not None or last_modified is not None:
+        cache.set(url, CachedResponse(etag, last_modified, payload))
+    return payload
+
+
+def get_json_page(url: str, session: requests.Session = None,
+                  stream: bool = False,
+                  decoder: Callable[[bytes], Any] = None
+                  ) -> Tuple[Any, Optional[str]]:
+    """Get one page of JSON and the URL of the next page.
+    The next URL comes from the ``Link: <...>; rel="next"`` header and
+    is None on the last page. With ``stream`` the page is an iterator
+    decoding its elements as they arrive, see ``get_json``.
     """
-    response = requests.get(url)
-    return response.json()
+    if session is None:
+        session = get_session()
+    response = session.get(url, stream=True) if stream else session.get(url)
+    next_link = response.links.get("next")
+    next_url = next_link["url"] if next_link else None
+    if stream:
+        return _iter_response_items(response), next_url
+    return (decoder or get_json_decoder())(response.content), next_url
+
+
+def iter_json_pages(url: str, session: requests.Session = None,
+                    stream: bool = False) -> Iterator[Any]:
+    """Yield every page of a paginated JSON resource.
+    A page is only requested once the previous one has been consumed.
+    """
+    while url is not None:
+        page, url = get_json_page(url, session, stream)
+        yield page
+
+
+def iter_json_items(url: str, session: requests.Session = None,
+                    stream: bool = False) -> Iterator[Any]:
+    """Yield the items of a paginated JSON array one at a time.
+    Only the page being consumed is held in memory, or with ``stream``
+    only the item being decoded.
+    Example
+    -------
+    >>> for repo in iter_json_items(repos_url, stream=True):
+    ...     print(repo["name"])
+    """
+    for page in iter_json_pages(url, session, stream):
+        yield from page
+
+
+class MemoizeStats:
+    """Hit, miss and eviction counters of a memoized property"""
+    __slots__ = ("hits", "misses", "evictions")
+
+    def __init__(self) -> None:
+        """Init method of MemoizeStats"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self) -> str:
+        """Counters as text"""
+        return "MemoizeStats(hits={}, misses={}, evictions={})".format(
+            self.hits, self.misses, self.evictions)
+
+
+class _Memoized:
+    """Per-instance cache slot shared by the memoize decorators.
+    The value lives in the ``_<name>`` attribute as it always has;
+    with a ``ttl`` its deadline is kept next to it, and with a
+    ``maxsize`` only that many instances keep a value at a time.
+    """
+
+    def __init__(self, fn: Callable, ttl: float = None,
+                 maxsize: int = None) -> None:
+        """Init method of _Memoized"""
+        self.fn = fn
+        self.attr_name = "_{}".format(fn.__name__)
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stats = MemoizeStats()
+        self._holders = OrderedDict()
+        self._holders_lock = threading.Lock()
+
+    def _cached(self, obj: Any) -> Any:
+        """Cached value of obj, _MISSING when absent or expired"""
+        value = getattr(obj, self.attr_name, _MISSING)
+        if value is _MISSING:
+            return value
+        deadline = obj.__dict__.get(_DEADLINES, {}).get(self.attr_name)
+        if deadline is not None and time.monotonic() >= deadline:
+            if self._forget(obj):
+                self.stats.evictions += 1
+            return _MISSING
+        self.stats.hits += 1
+        self._touch(obj)
+        return value
 
+    def _store(self, obj: Any, value: Any) -> None:
+        """Cache value on obj"""
+        setattr(obj, self.attr_name, value)
+        if self.ttl is not None:
+            deadlines = obj.__dict__.setdefault(_DEADLINES, {})
+            deadlines[self.attr_name] = time.monotonic() + self.ttl
+        self._touch(obj)
 
-def memoize(fn: Callable) -> Callable:
+    def _touch(self, obj: Any) -> None:
+        """Mark obj as most recently used, evicting past maxsize"""
+        if self.maxsize is None:
+            return
+        key = id(obj)
+        with self._holders_lock:
+            if key in self._holders:
+                self._holders.move_to_end(key)
+                return
+            try:
+                self._holders[key] = weakref.ref(
+                    obj, lambda _, key=key: self._holders.pop(key, None))
+            except TypeError:
+                return
+            evicted = []
+            while len(self._holders) > self.maxsize:
+                evicted.append(self._holders.popitem(last=False)[1]())
+        for holder in evicted:
+            if holder is not None and self._forget(holder):
+                self.stats.evictions += 1
+
+    def _forget(self, obj: Any) -> bool:
+        """Drop the cached value of obj"""
+        obj.__dict__.get(_DEADLINES, {}).pop(self.attr_name, None)
+        return obj.__dict__.pop(self.attr_name, _MISSING) is not _MISSING
+
+    def invalidate(self, obj: Any) -> bool:
+        """Drop the cached value of obj, True if there was one"""
+        with self._holders_lock:
+            self._holders.pop(id(obj), None)
+        return self._forget(obj)
+
+
+class MemoizedProperty(_Memoized, property):
+    """Property caching its value on the instance, see ``memoize``.
+    Concurrent first accesses from several threads are single-flight:
+    one thread computes the value while the others wait for it.
+    """
+
+    def __init__(self, fn: Callable, ttl: float = None,
+                 maxsize: int = None) -> None:
+        """Init method of MemoizedProperty"""
+        property.__init__(self, self._get, doc=fn.__doc__)
+        _Memoized.__init__(self, fn, ttl, maxsize)
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock_for(self, obj: Any) -> threading.Lock:
+        """Lock serializing the computation of obj's value"""
+        lock = self._locks.get(id(obj))
+        if lock is not None:
+            return lock
+        with self._locks_lock:
+            lock = self._locks.get(id(obj))
+            if lock is None:
+                lock = threading.Lock()
+                try:
+                    weakref.finalize(obj, self._locks.pop, id(obj), None)
+                except TypeError:
+                    return self._locks_lock
+                self._locks[id(obj)] = lock
+        return lock
+
+    def _get(self, obj: Any) -> Any:
+        """Cached value, recomputed when missing or expired"""
+        value = self._cached(obj)
+        if value is not _MISSING:
+            return value
+        with self._lock_for(obj):
+            value = self._cached(obj)
+            if value is _MISSING:
+                self.stats.misses += 1
+                value = self.fn(obj)
+                self._store(obj, value)
+        return value
+
+
+class AsyncMemoizedMethod(_Memoized):
+    """Coroutine method caching its result, see ``async_memoize``.
+    Concurrent awaits share one in-flight call; cancelling one awaiter
+    does not cancel the call for the others.
+    """
+
+    def __get__(self, obj: Any, cls: type = None) -> Callable:
+        """Bind to obj"""
+        if obj is None:
+            return self
+        return MethodType(self._call, obj)
+
+    async def _call(self, obj: Any) -> Any:
+        """Cached result, computed once however many await it"""
+        value = self._cached(obj)
+        if value is not _MISSING:
+            return value
+        in_flight = obj.__dict__.setdefault(_IN_FLIGHT, {})
+        task = in_flight.get(self.attr_name)
+        if task is None:
+            self.stats.misses += 1
+            task = asyncio.ensure_future(self._compute(obj))
+            in_flight[self.attr_name] = task
+        return await asyncio.shield(task)
+
+    async def _compute(self, obj: Any) -> Any:
+        """Await fn and cache its result"""
+        try:
+            value = await self.fn(obj)
+            self._store(obj, value)
+            return value
+        finally:
+            obj.__dict__[_IN_FLIGHT].pop(self.attr_name, None)
+
+
+def memoize(fn: Callable = None, *, ttl: float = None,
+            maxsize: int = None) -> Callable:
     """Decorator to memoize a method.
+    Parameters
+    ----------
+    ttl: float
+        seconds a value stays cached, forever when None
+    maxsize: int
+        number of instances keeping a cached value at the same time,
+        least recently used first out; unbounded when None
     Example
     -------
     class MyClass:
@@ -56,20 +763,58 @@ def memoize(fn: Callable) -> Callable:
         def a_method(self):
             print("a_method called")
             return 42
+
+        @memoize(ttl=60)
+        def b_method(self):
+            return 43
     >>> my_object = MyClass()
     >>> my_object.a_method
     a_method called
     42
     >>> my_object.a_method
     42
+    >>> MyClass.a_method.stats
+    MemoizeStats(hits=1, misses=1, evictions=0)
+    >>> invalidate(my_object, "a_method")
+    >>> my_object.a_method
+    a_method called
+    42
     """
-    attr_name = "_{}".format(fn.__name__)
+    if fn is None:
+        return lambda fn: memoize(fn, ttl=ttl, maxsize=maxsize)
+    return wraps(fn)(MemoizedProperty(fn, ttl, maxsize))
 
-    @wraps(fn)
-    def memoized(self):
-        """"memoized wraps"""
-        if not hasattr(self, attr_name):
-            setattr(self, attr_name, fn(self))
-        return getattr(self, attr_name)
 
-    return property(memoized)
\ No newline at end of file
+def async_memoize(fn: Callable = None, *, ttl: float = None,
+                  maxsize: int = None) -> Callable:
+    """Decorator to memoize a coroutine method.
+    Same options as ``memoize``, but the decorated method stays a
+    method and is awaited; concurrent awaits share one call.
+    Example
+    -------
+    class MyClass:
+        @async_memoize
+        async def a_method(self):
+            return await fetch()
+    >>> my_object = MyClass()
+    >>> await asyncio.gather(my_object.a_method(), my_object.a_method())
+    """
+    if fn is None:
+        return lambda fn: async_memoize(fn, ttl=ttl, maxsize=maxsize)
+    return wraps(fn)(AsyncMemoizedMethod(fn, ttl, maxsize))
+
+
+def invalidate(obj: Any, *names: str) -> None:
+    """Drop the memoized values of obj.
+    Every memoized property of obj is invalidated when no ``names``
+    are given.
+    """
+    cls = type(obj)
+    if not names:
+        names = [name for name in dir(cls)
+                 if isinstance(getattr(cls, name), _Memoized)]
+    for name in names:
+        prop = getattr(cls, name, None)
+        if not isinstance(prop, _Memoized):
+            raise ValueError("{!r} is not memoized".format(name))
+        prop.invalidate(obj)
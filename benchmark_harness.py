@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the async projects
+
+Generalizes measure_time (0x01) and measure_runtime (0x02): every case
+is run over a parameter sweep with warmup rounds and repetitions, and
+reports latency percentiles, throughput, peak allocated memory and
+event-loop lag.
+Results can be written as JSON and compared with an earlier run.
+With --virtual the cases run on the 0x01 virtual-clock loop: latencies
+are then logical seconds and sleeps cost no wall time; the wall time
+is reported next to them.
+
+    ./benchmark_harness.py wait_n task_wait_n --repeat 20 -o now.json
+    ./benchmark_harness.py wait_n --sweep n=100,1000 --compare old.json
+    ./benchmark_harness.py async_comprehension --virtual
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import (Any, Awaitable, Callable, ContextManager, Dict, Iterator,
+                    List, NamedTuple, Tuple)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+for directory in ("0x01-python_async_function",
+                  "0x02-python_async_comprehension",
+                  "0x03-Unittests_and_integration_tests"):
+    sys.path.insert(0, os.path.join(ROOT, directory))
+
+LAG_INTERVAL = 0.001
+
+
+class Case(NamedTuple):
+    """A benchmarked coroutine
+
+    run builds the coroutine from the sweep parameters, items tells how
+    many units of work one run does, and sweep holds the default
+    parameter values. fixture, when set, is a context manager factory
+    taking the sweep parameters; it is entered once per point, outside
+    the timed runs, and what it yields is passed to run as extra
+    keyword arguments.
+    """
+    run: Callable[..., Awaitable[Any]]
+    items: Callable[..., int]
+    sweep: Dict[str, List[Any]]
+    fixture: Callable[..., ContextManager[Dict[str, Any]]] = None
+
+
+def wait_n_case(n: int, max_delay: float) -> Awaitable[Any]:
+    """wait_n from 0x01"""
+    return __import__('1-concurrent_coroutines').wait_n(n, max_delay)
+
+
+def task_wait_n_case(n: int, max_delay: float) -> Awaitable[Any]:
+    """task_wait_n from 0x01"""
+    return __import__('4-tasks').task_wait_n(n, max_delay)
+
+
+def async_comprehension_case(parallel: int) -> Awaitable[Any]:
+    """`parallel` concurrent async_comprehension from 0x02"""
+    async_comprehension = __import__(
+        '1-async_comprehension').async_comprehension
+    return asyncio.gather(*(async_comprehension() for _ in range(parallel)))
+
+
+async def fair_merge_case(sources: int, count: int) -> Any:
+    """fair_merge from 0x02 over sources generators of count items"""
+    fair_merge = __import__('5-fair_merge').fair_merge
+    ticks = __import__('6-measure_merge').ticks
+    async for _ in fair_merge(ticks(count) for _ in range(sources)):
+        pass
+
+
+@contextlib.contextmanager
+def github_client_fixture(orgs: int,
+                          concurrency: int) -> Iterator[Dict[str, Any]]:
+    """Local stub serving the orgs, and a session pooled for it"""
+    from benchmarks import StubServer
+    from utils import make_session
+
+    names = ["org{}".format(i) for i in range(orgs)]
+    routes = {"/orgs/" + name: {"login": name} for name in names}
+    with StubServer(routes) as base_url:
+        session = make_session(pool_maxsize=concurrency)
+        try:
+            yield {"base_url": base_url, "session": session}
+        finally:
+            session.close()
+
+
+async def github_client_case(orgs: int, concurrency: int, base_url: str,
+                             session: Any) -> Any:
+    """AsyncGithubOrgClient.fetch_orgs from 0x03 against a local stub"""
+    from client import AsyncGithubOrgClient
+
+    names = ["org{}".format(i) for i in range(orgs)]
+    client_class = type("StubClient", (AsyncGithubOrgClient,),
+                        {"ORG_URL": base_url + "/orgs/{org}"})
+    return await client_class.fetch_orgs(names, concurrency,
+                                         session=session)
+
+
+CASES: Dict[str, Case] = {
+    "wait_n": Case(wait_n_case, lambda n, **_: n,
+                   {"n": [100, 1000, 10000], "max_delay": [0]}),
+    "task_wait_n": Case(task_wait_n_case, lambda n, **_: n,
+                        {"n": [100, 1000, 10000], "max_delay": [0]}),
+    "async_comprehension": Case(async_comprehension_case,
+                                lambda parallel: parallel * 10,
+                                {"parallel": [1, 4]}),
+    "fair_merge": Case(fair_merge_case,
+                       lambda sources, count: sources * count,
+                       {"sources": [100, 1000], "count": [10]}),
+    "github_client": Case(github_client_case, lambda orgs, **_: orgs,
+                          {"orgs": [100], "concurrency": [1, 10]},
+                          github_client_fixture),
+}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of values"""
+    ordered = sorted(values)
+    rank = max(1, round(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_alloc(run: Callable[[], Any]) -> int:
+    """Peak bytes allocated by Python objects while run executes
+
+    Unlike the process's peak RSS, this is specific to the run: it does
+    not carry over from earlier, larger points of the sweep.
+    """
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+async def probe_lag(lags: List[float]) -> None:
+    """Record how late the loop wakes up a LAG_INTERVAL sleep"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LAG_INTERVAL
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(loop.time() - expected)
+
+
+async def timed_run(case: Case, params: Dict[str, Any], lags: List[float],
+                    virtual: bool = False) -> Tuple[float, float]:
+    """Seconds one run of case takes, with the lag probe running
+
+    Returns:
+        Tuple[float, float]: seconds on the loop's clock, which are
+            logical with virtual, and wall seconds
+    """
+    clock = time.perf_counter
+    if virtual:
+        clock = asyncio.get_running_loop().time
+    probe = asyncio.ensure_future(probe_lag(lags))
+    try:
+        start_wall, start_time = time.perf_counter(), clock()
+        await case.run(**params)
+        return clock() - start_time, time.perf_counter() - start_wall
+    finally:
+        probe.cancel()
+
+
+def measure(case: Case, params: Dict[str, Any], repeat: int = 5,
+            warmup: int = 1, virtual: bool = False) -> Dict[str, Any]:
+    """Run case with params and summarize the timed repetitions
+
+    Args:
+        case (Case): what to run
+        params (Dict[str, Any]): one point of the sweep
+        repeat (int): timed runs
+        warmup (int): untimed runs before them
+        virtual (bool): run on the virtual-clock loop
+
+    Returns:
+        Dict[str, Any]: latency percentiles in seconds, throughput in
+            items per second (None when the runs took no time, as
+            zero-delay cases do on the virtual clock), wall seconds per
+            run, peak allocated bytes of one extra untimed run, traced
+            with tracemalloc, and loop lag in seconds
+    """
+    run_loop = asyncio.run
+    if virtual:
+        run_loop = __import__('11-virtual_clock').run_virtual
+    fixture = contextlib.nullcontext({})
+    if case.fixture is not None:
+        fixture = case.fixture(**params)
+    latencies, walls, lags = [], [], []
+    with fixture as extra:
+        arguments = dict(params, **extra)
+        for _ in range(warmup):
+            run_loop(timed_run(case, arguments, [], virtual))
+        for _ in range(repeat):
+            latency, wall = run_loop(
+                timed_run(case, arguments, lags, virtual))
+            latencies.append(latency)
+            walls.append(wall)
+        alloc = peak_alloc(
+            lambda: run_loop(timed_run(case, arguments, [], virtual)))
+    items = case.items(**params)
+    elapsed = sum(latencies)
+    return {
+        "params": params,
+        "repeat": repeat,
+        "virtual": virtual,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "throughput": items * repeat / elapsed if elapsed else None,
+        "wall_p50": percentile(walls, 0.50),
+        "peak_alloc": alloc,
+        "loop_lag_mean": sum(lags) / len(lags) if lags else 0.0,
+        "loop_lag_max": max(lags, default=0.0),
+    }
+
+
+def sweep(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Every combination of the grid values"""
+    names = list(grid)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(grid[name] for name in names))]
+
+
+def git_revision() -> str:
+    """Commit of the working tree, empty when unavailable"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(names: List[str], overrides: Dict[str, List[Any]],
+        repeat: int, warmup: int, virtual: bool = False) -> Dict[str, Any]:
+    """Benchmark the named cases over their sweeps
+
+    Args:
+        names (List[str]): case names, all cases when empty
+        overrides (Dict[str, List[Any]]): sweep values replacing the
+            defaults of the cases that take those parameters
+        repeat (int): timed runs per point
+        warmup (int): untimed runs per point
+        virtual (bool): run on the virtual-clock loop
+
+    Returns:
+        Dict[str, Any]: environment metadata and one result per point
+    """
+    results = []
+    for name in names or CASES:
+        case = CASES[name]
+        grid = {param: overrides.get(param, values)
+                for param, values in case.sweep.items()}
+        for params in sweep(grid):
+            result = measure(case, params, repeat, warmup, virtual)
+            result["case"] = name
+            results.append(result)
+            print_result(result)
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """Identity of a result across runs"""
+    return json.dumps([result["case"], result["params"],
+                       result.get("virtual", False)], sort_keys=True)
+
+
+def print_result(result: Dict[str, Any], baseline: Dict = None) -> None:
+    """One line per result, with the p50 change against baseline"""
+    params = " ".join("{}={}".format(*item)
+                      for item in result["params"].items())
+    throughput = result["throughput"]
+    line = ("{:20} {:28} p50 {:9.4f}s p95 {:9.4f}s p99 {:9.4f}s "
+            "{:>12}/s alloc {:7.1f}MiB lag {:7.3f}ms").format(
+        result["case"], params, result["p50"], result["p95"],
+        result["p99"], "-" if throughput is None else
+        "{:.1f}".format(throughput), result["peak_alloc"] / 2 ** 20,
+        result["loop_lag_mean"] * 1000)
+    if result.get("virtual"):
+        line += " wall p50 {:.4f}s".format(result["wall_p50"])
+    if baseline is not None and baseline["p50"]:
+        line += " p50 {:+.1%}".format(result["p50"] / baseline["p50"] - 1)
+    print(line)
+
+
+def compare(report: Dict[str, Any], path: str) -> None:
+    """Print the results of report against the matching ones in path"""
+    with open(path) as file:
+        old = json.load(file)
+    baselines = {result_key(result): result for result in old["results"]}
+    print("against {} ({})".format(path, old.get("revision") or "?"))
+    for result in report["results"]:
+        print_result(result, baselines.get(result_key(result)))
+
+
+def parse_sweep(values: List[str]) -> Dict[str, List[Any]]:
+    """`name=v1,v2` arguments as a sweep grid of JSON values"""
+    grid = {}
+    for value in values:
+        name, _, items = value.partition("=")
+        grid[name] = [json.loads(item) for item in items.split(",")]
+    return grid
+
+
+def main(argv: List[str] = None) -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("cases", nargs="*",
+                        help="cases to run, all by default: "
+                        + ", ".join(CASES))
+    parser.add_argument("--sweep", action="append", default=[],
+                        metavar="NAME=V1,V2", help="override a parameter")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--virtual", action="store_true",
+                        help="run on the virtual-clock event loop")
+    parser.add_argument("-o", "--output", help="write the report as JSON")
+    parser.add_argument("--compare", help="JSON report to compare with")
+    args = parser.parse_args(argv)
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error("unknown cases: " + ", ".join(sorted(unknown)))
+
+    report = run(args.cases, parse_sweep(args.sweep), args.repeat,
+                 args.warmup, args.virtual)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()